@@ -2,10 +2,13 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from data import Extractor, Constants
+import classify
+import export
+import metrics
 
 import json
-import csv
+import itertools
+import threading
 from flask import Flask, Response, jsonify, request, send_file, render_template
 from flask_cors import CORS
 import io
@@ -13,6 +16,33 @@ import io
 app = Flask(__name__)
 CORS(app)
 
+# The scraping stack (requests, bs4, the caches) is imported by the first route that
+# needs it, so a cold start that only serves / or /api/test loads little beyond Flask.
+# bench/import_budget.py checks that this stays true.
+_jobs = None
+_jobs_lock = threading.Lock()
+
+def get_jobs():
+    """Process-wide JobManager, created on first use"""
+    global _jobs
+    if _jobs is None:
+        with _jobs_lock:
+            if _jobs is None:
+                from scraper import ScrapeEngine
+                from jobs import JobManager
+                from snapshot import Snapshot
+                import result_cache
+
+                # Shared across requests so the concurrency limits apply to the whole worker.
+                # Recently extracted rows and schools in a fresh crawler snapshot are served without scraping.
+                engine = ScrapeEngine(snapshot=Snapshot(), result_cache=result_cache.default_cache())
+                _jobs = JobManager(engine)
+    return _jobs
+
+def get_engine():
+    """Process-wide ScrapeEngine, created on first use"""
+    return get_jobs().engine
+
 COLUMN_ORDER = [
     'University',
     'Location',
@@ -29,93 +59,325 @@ COLUMN_ORDER = [
     'Application Deadlines'
 ]
 
-def reorder_columns(data):
-    """Reorder dictionary keys to maintain consistent column order"""
-    ordered = {}
-    for key in COLUMN_ORDER:
-        if key in data:
-            ordered[key] = data[key]
-
-    for key in data:
-        if key not in ordered:
-            ordered[key] = data[key]
-
-    return ordered
-
 @app.route('/api/test')
 def test():
     return jsonify({"status": "API route works"})
 
 
-@app.route('/api/schools', methods=['POST', 'OPTIONS'])
-def get_schools():
-    if request.method == 'OPTIONS':
-        return '', 204
-
-    data = request.json
-    schools = data.get('schools', [])
-    test_option = data.get('test_pref', '3')
+def parse_test_pref(test_option):
+    from data import Constants
 
     if test_option in ['1', 1]:
-        test_pref = Constants.ACT
+        return Constants.ACT
     elif test_option in ['2', 2]:
-        test_pref = Constants.SAT
+        return Constants.SAT
     else:
-        test_pref = Constants.BOTH
+        return Constants.BOTH
+
+def parse_fields(fields):
+    """Requested subset of COLUMN_ORDER, or None for every column; returns (fields, error message or None)"""
+    if not fields:
+        return None, None
+    if not isinstance(fields, list) or not all(isinstance(field, str) for field in fields):
+        return None, 'fields must be a list of strings, like ["SAT Range", "Cost of Attendance"]'
+    unknown_fields = [field for field in fields if field not in COLUMN_ORDER]
+    if unknown_fields:
+        return fields, f"Unknown fields: {', '.join(unknown_fields)}"
+    return fields, None
+
+def school_trace(school, extractor):
+    """Per-page timings for a live scrape; rows from the result cache or snapshot have none"""
+    if extractor is None:
+        return {'school': school, 'source': 'cached'}
+    return {'source': 'live', **extractor.page_trace()}
+
+def read_schools_request():
+    """(schools, test_pref, fields, error response) from a /api/schools style request body"""
+    data = request.json
+    schools = data.get('schools', [])
+    test_pref = parse_test_pref(data.get('test_pref', '3'))
+    fields, fields_error = parse_fields(data.get('fields'))
 
     if not schools:
-        return jsonify({'error': 'No schools provided'}), 400
+        return schools, test_pref, fields, (jsonify({'error': 'No schools provided'}), 400)
+    if fields_error:
+        return schools, test_pref, fields, (jsonify({'error': fields_error}), 400)
+    return schools, test_pref, fields, None
 
-    results = []
-    skipped = []
+def read_students():
+    """
+    (student, students, error response) from the optional "student" profile
+    ({"gpa": 3.9, "sat": 1480, "act": 33}, any may be left out) and "students" list
+    """
+    data = request.json
+    try:
+        student = classify.student_from_json(data['student']) if data.get('student') else None
+        students = [classify.student_from_json(profile) for profile in data.get('students') or []]
+    except ValueError as e:
+        return None, [], (jsonify({'error': str(e)}), 400)
+    return student, students, None
 
-    for school in schools:
-        extractor = Extractor(school.strip())
-        school_data = extractor.get_full_data(test_pref)
+def schools_response(schools, test_pref, scraped, student=None, students=()):
+    """
+    JSON body for /api/schools from engine.scrape()-style [(extractor, data)] results.
+    student fills in the Likely/Target/Reach column; students adds "classifications",
+    one list of labels per student for the rows in "data".
+    """
+    scraped = list(scraped)
+    if student:
+        filled = classify.fill(student, [school_data for _, school_data in scraped])
+        scraped = [(extractor, school_data) for (extractor, _), school_data in zip(scraped, filled)]
 
+    results = []
+    found = []
+    skipped = []
+    traces = []
+    saved = []
+    for school, (extractor, school_data) in zip(schools, scraped):
+        saved.append((school, school_data))
+        traces.append(school_trace(school, extractor))
         if school_data:
-            ordered_data = reorder_columns(school_data)
-            results.append(ordered_data)
+            results.append(school_data.to_row(COLUMN_ORDER))
+            found.append(school_data)
         else:
             skipped.append(school)
 
     response_data = {
         'data': results,
         'skipped': skipped,
-        'count': len(results)
+        'count': len(results),
+        # Pass to /api/export instead of uploading the rows again
+        'result_id': get_jobs().store.save(saved, test_pref)
     }
+    if students:
+        response_data['classifications'] = classify.classify(students, found)
+    if request.json.get('metrics'):
+        response_data['metrics'] = traces
 
     return Response(
         json.dumps(response_data),
         mimetype='application/json'
     )
 
-@app.route('/api/export', methods=['POST', 'OPTIONS'])
-def export_csv():
+@app.route('/api/schools', methods=['POST', 'OPTIONS'])
+def get_schools():
+    """
+    Scrape schools; pass "metrics": true to also get per-school, per-page timings, and a
+    "student" profile (or a "students" list) to classify the schools as Likely/Target/Reach
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    schools, test_pref, fields, error = read_schools_request()
+    student, students, student_error = read_students()
+    if error or student_error:
+        return error or student_error
+    return schools_response(schools, test_pref, get_engine().scrape(schools, test_pref, fields), student, students)
+
+@app.route('/api/schools/async', methods=['POST', 'OPTIONS'])
+async def get_schools_async():
+    """
+    Same as /api/schools, but every school's pages are fetched concurrently on one event
+    loop (httpx) instead of holding a thread per school. Needs flask[async] installed.
+    """
     if request.method == 'OPTIONS':
         return '', 204
-        
+
+    schools, test_pref, fields, error = read_schools_request()
+    student, students, student_error = read_students()
+    if error or student_error:
+        return error or student_error
+    return schools_response(schools, test_pref, await get_engine().scrape_async(schools, test_pref, fields),
+                            student, students)
+
+@app.route('/api/schools/stream', methods=['POST', 'OPTIONS'])
+def stream_schools():
+    """
+    Same input as /api/schools (schools, test_pref, optional fields), but answers with
+    newline-delimited JSON as schools finish:
+    {"index": i, "data": {...}} or {"index": i, "skipped": "name"} per school, in completion
+    order, then {"done": true, "count": n, "skipped": [...], "result_id": id} with skipped
+    in input order. With "metrics": true each school line also carries its page timings;
+    a "student" profile fills in Likely/Target/Reach ("students" is only for /api/schools).
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    schools, test_pref, fields, error = read_schools_request()
+    student, _, student_error = read_students()
+    if error or student_error:
+        return error or student_error
+    with_metrics = request.json.get('metrics')
+
+    def generate():
+        count = 0
+        skipped = {}
+        scraped = [None] * len(schools)
+        for index, extractor, school_data in get_engine().scrape_iter(schools, test_pref, fields):
+            if student and school_data:
+                school_data = classify.fill(student, [school_data])[0]
+            scraped[index] = (schools[index], school_data)
+            message = {'index': index}
+            if school_data:
+                count += 1
+                message['data'] = school_data.to_row(COLUMN_ORDER)
+            else:
+                skipped[index] = schools[index]
+                message['skipped'] = schools[index]
+            if with_metrics:
+                message['metrics'] = school_trace(schools[index], extractor)
+            yield json.dumps(message) + '\n'
+        yield json.dumps({
+            'done': True,
+            'count': count,
+            'skipped': [skipped[i] for i in sorted(skipped)],
+            'result_id': get_jobs().store.save(scraped, test_pref)
+        }) + '\n'
+
+    # X-Accel-Buffering stops proxies from holding the stream back until it ends
+    return Response(generate(), mimetype='application/x-ndjson', headers={'X-Accel-Buffering': 'no'})
+
+def job_response(status):
+    status['data'] = [school.to_row(COLUMN_ORDER) for school in status['data']]
+    status['count'] = len(status['data'])
+    return jsonify(status)
+
+@app.route('/api/jobs', methods=['POST', 'OPTIONS'])
+def create_job():
+    """Start scraping a school list in the background; poll GET /api/jobs/<job_id> for results"""
+    if request.method == 'OPTIONS':
+        return '', 204
+
     data = request.json
-    schools_data = data.get('data', [])
+    schools = [school.strip() for school in data.get('schools', [])]
+    test_pref = parse_test_pref(data.get('test_pref', '3'))
 
-    if not schools_data:
-        return jsonify({'error': 'No data to export'}), 400
+    if not schools:
+        return jsonify({'error': 'No schools provided'}), 400
+
+    job_id = get_jobs().submit(schools, test_pref)
+    return job_response(get_jobs().status(job_id)), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    status = get_jobs().status(job_id)
+    if status is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return job_response(status)
 
-    ordered_schools_data = [reorder_columns(school) for school in schools_data]
+@app.route('/api/jobs/<job_id>/resume', methods=['POST', 'OPTIONS'])
+def resume_job(job_id):
+    """Retry the schools in a job that were skipped, failed or interrupted"""
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    if get_jobs().resume(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return job_response(get_jobs().status(job_id)), 202
+
+@app.route('/api/query', methods=['GET', 'POST', 'OPTIONS'])
+def query_schools():
+    """
+    Filter and sort the schools in the crawler snapshot without scraping, e.g.
+    {"where": "acceptance_rate > 30 and sat_mid < 1400", "sort": "cost", "limit": 20}.
+    Prefix sort with "-" for descending; GET takes the same keys as query parameters.
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
 
-    output = io.StringIO()
-    fieldnames = [col for col in COLUMN_ORDER if col in ordered_schools_data[0]]
+    from school_query import parse_sort, parse_where
 
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(ordered_schools_data)
+    data = (request.json or {}) if request.method == 'POST' else request.args
+    try:
+        conditions = parse_where(data.get('where', ''))
+        sort, descending = parse_sort(data.get('sort'))
+        limit = int(data['limit']) if data.get('limit') else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name='college_data.csv'
+    table = get_engine().snapshot.table()
+    results = table.query(conditions, sort, descending, limit)
+    return Response(
+        json.dumps({
+            'data': [school.to_row(COLUMN_ORDER) for school in results],
+            'count': len(results),
+            'schools': len(table)
+        }),
+        mimetype='application/json'
+    )
+
+@app.route('/api/cache')
+def cache_stats():
+    return jsonify(get_engine().result_cache.stats())
+
+@app.route('/api/metrics')
+def get_metrics():
+    """Scrape timings and counters in the Prometheus text format"""
+    from data import page_flights
+
+    engine = get_engine()
+    cache = engine.result_cache.stats()
+    extra = [
+        ('ufit_result_cache_hits', 'Rows served from the in-process result cache', cache['hits']),
+        ('ufit_result_cache_backend_hits', 'Rows served from the shared result cache backend', cache['backend_hits']),
+        ('ufit_result_cache_misses', 'Rows not found in the result cache', cache['misses']),
+        ('ufit_school_scrapes_shared', 'Live scrapes answered by an identical scrape already in flight',
+         engine.school_flights.shared),
+        ('ufit_page_fetches_shared', 'Page fetches answered by an identical fetch already in flight',
+         page_flights.shared),
+    ]
+    return Response(metrics.render(extra), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/export', methods=['GET', 'POST', 'OPTIONS'])
+def export_data():
+    """
+    Download results as a spreadsheet (format=csv, tsv or xlsx; csv by default).
+    GET /api/export?ids=<result_id>,<result_id> exports rows saved by /api/schools,
+    /api/schools/stream or /api/jobs, in that order. POST {"data": [...]} still exports
+    rows sent by the client.
+    """
+    if request.method == 'OPTIONS':
+        return '', 204
+
+    data = request.json if request.method == 'POST' else request.args
+    file_format = data.get('format', 'csv')
+    if file_format not in export.FORMATS:
+        return jsonify({'error': f"Unknown format: {file_format}"}), 400
+
+    if request.method == 'POST' and data.get('data'):
+        rows = iter(data['data'])
+        columns = {col for row in data['data'] for col in row}
+    else:
+        ids = data.get('ids', [])
+        ids = [i.strip() for i in ids.split(',') if i.strip()] if isinstance(ids, str) else ids
+        missing = [i for i in ids if get_jobs().store.test_pref(i) is None]
+        if missing:
+            return jsonify({'error': f"Results not found: {', '.join(missing)}"}), 404
+        rows = get_jobs().store.iter_data(ids)
+        columns = get_jobs().store.columns(ids)
+
+    first = next(rows, None)
+    if first is None:
+        return jsonify({'error': 'No data to export'}), 400
+    rows = itertools.chain([first], rows)
+    # Results saved with different fields or test preferences hold different columns; keep them all
+    fieldnames = [col for col in COLUMN_ORDER if col in columns]
+
+    mimetype, extension = export.FORMATS[file_format]
+    download_name = f'college_data.{extension}'
+    if file_format == 'xlsx':
+        try:
+            body = export.xlsx_bytes(rows, fieldnames)
+        except ImportError:
+            return jsonify({'error': 'XLSX export needs openpyxl installed'}), 400
+        return send_file(io.BytesIO(body), mimetype=mimetype, as_attachment=True, download_name=download_name)
+
+    # Written and sent one row at a time
+    delimiter = '\t' if file_format == 'tsv' else ','
+    return Response(
+        export.iter_delimited(rows, fieldnames, delimiter),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={download_name}'}
     )
 
 @app.route('/')
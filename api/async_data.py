@@ -0,0 +1,116 @@
+"""
+Extractor for asyncio, fetching with httpx instead of blocking requests.
+
+AsyncExtractor resolves the school's URL and fetches its subpages as coroutines, so one
+event loop can keep many schools' page fetches in flight at once. Once the pages are in,
+the getters, and so the output, are exactly Extractor's.
+
+    async with http_client.async_client() as client:
+        extractor = await AsyncExtractor.create("ucla", client)
+        if await extractor.prefetch_async(pages):
+            data = extractor.get_full_data(test_pref)
+"""
+from data import Extractor, PAGES, _retry_count, _source
+from page_index import PageIndex
+import data
+import http_client
+import page_cache
+from contextlib import nullcontext
+import asyncio
+import time
+
+
+class AsyncExtractor(Extractor):
+    def __init__(self, school_name, client, limiter=None):
+        # No URL lookup here, it needs awaiting; build instances with create()
+        self._init_state(school_name, limiter)
+        self._client = client
+        self.name_url = self.base_url = None
+
+    @classmethod
+    async def create(cls, school_name, client, limiter=None):
+        """
+        An extractor with its URL resolved. client is an httpx.AsyncClient; limiter, if given,
+        is called with a URL and returns an async context manager holding a request slot.
+        """
+        extractor = cls(school_name, client, limiter)
+        extractor.name, extractor.name_url, extractor.base_url = await extractor._find_valid_url_async()
+        return extractor
+
+    async def _find_valid_url_async(self):
+        # The slug cache is SQLite; keep its reads and writes off the event loop
+        known = await asyncio.to_thread(self._known_url)
+        if known:
+            return known
+
+        candidates = self._url_candidates()
+        if data.PROBE_MODE == "concurrent":
+            responses = await asyncio.gather(*(self._probe_async(name_url) for _, name_url in candidates))
+        else:
+            # Stop probing at the first hit
+            responses = []
+            for _, name_url in candidates:
+                r = await self._probe_async(name_url)
+                responses.append(r)
+                if r is not None and r.status_code == 200:
+                    break
+        return await asyncio.to_thread(self._choose_url, candidates, responses)
+
+    async def _probe_async(self, name_url):
+        try:
+            return await self._fetch_async(f"{data.SEARCH_URL}/{name_url}", "base", timeout=5)
+        except Exception:
+            return None
+
+    async def prefetch_async(self, pages=tuple(PAGES)):
+        """Fetch the first of pages, then the rest concurrently; returns False if the school was not found"""
+        if "base" in self._pages and self._pages["base"] is None:
+            return False
+        if pages[0] not in self._pages:
+            self._pages[pages[0]] = await self._load_page_async(pages[0])
+        if self._pages[pages[0]] is None:
+            return False
+        missing = [page for page in pages if page not in self._pages]
+        for page, index in zip(missing, await asyncio.gather(*(self._load_page_async(page) for page in missing))):
+            self._pages[page] = index
+        return True
+
+    async def _load_page_async(self, page):
+        soup = await self._get_soup_async(f"{self.base_url}{PAGES[page]}", page)
+        return PageIndex(soup) if soup is not None else None
+
+    async def _get_soup_async(self, url, page):
+        # Parsing is CPU work; run it off the loop so other schools' fetches keep going meanwhile
+        if page in self._html:
+            return await asyncio.to_thread(self._parse, url, page, self._html.pop(page))
+        try:
+            r = await self._fetch_async(url, page)
+            if r.status_code == 200:
+                return await asyncio.to_thread(self._parse, url, page, r.text)
+            else:
+                self._url_error_handling(url, r.status_code)
+                return None
+        except Exception as e:
+            self._url_error_handling(url, error=str(e))
+            return None
+
+    async def _fetch_async(self, url, page, timeout=http_client.TIMEOUT):
+        """_fetch() on the event loop: through the page cache and page_flights, only counting requests that hit the network"""
+        network = {}
+        async def network_get(extra_headers):
+            self._count_request()
+            async with self._limiter(url) if self._limiter else nullcontext():
+                r = await http_client.get_async(self._client, url, {**self.headers, **extra_headers}, timeout)
+            network["status"] = r.status_code
+            network["retries"] = _retry_count(r)
+            return r
+
+        start = time.perf_counter()
+        try:
+            # Same keys as Extractor._fetch, so sync and async fetches of one URL share a request
+            r = await data.page_flights.do_async(url, lambda: page_cache.fetch_async(url, page, network_get))
+        except Exception as e:
+            self._record_fetch(url, page, time.perf_counter() - start, error=str(e))
+            raise
+        self._record_fetch(url, page, time.perf_counter() - start, r, _source(r, network), network.get("retries", 0))
+        return r
@@ -0,0 +1,190 @@
+"""
+Likely/Target/Reach for students against scraped schools.
+
+A student's SAT or ACT (whichever places them better) is compared with each school's
+middle 50% range: at or above the top is Likely, inside it Target, below it Reach. A GPA
+more than GPA_MARGIN under the school's average moves that one step toward Reach; with
+no test comparison, GPA against the average decides on its own. Selective schools cap
+the result: under SELECTIVE_RATE% admitted is always a Reach, under COMPETITIVE_RATE%
+never better than Target. Pairs with nothing to compare keep the blank placeholder.
+
+classify() works on whole batches (every student against every school). With NumPy
+installed it does so with array comparisons over a students x schools grid; without it,
+the same rules run in plain Python.
+
+    classify([Student(3.9, 1480, None)], records)  ->  [["Target", "Reach", ...]]
+"""
+from collections import namedtuple
+import csv
+
+Student = namedtuple("Student", ["gpa", "sat", "act"])
+
+LABELS = ("Likely", "Target", "Reach")
+UNKNOWN = " "  # same as the scraped placeholder, left for a counselor to fill in
+
+GPA_MARGIN = 0.2
+SELECTIVE_RATE = 15
+COMPETITIVE_RATE = 30
+
+# Valid score ranges, to catch a swapped SAT/ACT or a typo
+LIMITS = {"gpa": (0, 5), "sat": (400, 1600), "act": (1, 36)}
+
+
+def make_student(gpa=None, sat=None, act=None):
+    """A Student from numbers or numeric strings (blank for missing); raises ValueError if one is invalid"""
+    values = {}
+    for field, value in (("gpa", gpa), ("sat", sat), ("act", act)):
+        if value is None or str(value).strip() == "":
+            values[field] = None
+            continue
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field.upper()} must be a number, got {value!r}")
+        low, high = LIMITS[field]
+        if not low <= number <= high:
+            raise ValueError(f"{field.upper()} must be between {low} and {high}, got {value}")
+        values[field] = number
+    return Student(**values)
+
+
+def student_from_json(obj):
+    """A Student from a request's {"gpa": ..., "sat": ..., "act": ...}"""
+    if not isinstance(obj, dict):
+        raise ValueError("A student profile must be an object like {\"gpa\": 3.9, \"sat\": 1480}")
+    return make_student(obj.get("gpa"), obj.get("sat"), obj.get("act"))
+
+
+def parse_student(text):
+    """"gpa=3.9, sat=1480" -> Student(3.9, 1480.0, None)"""
+    values = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        field, _, value = part.partition("=")
+        field = field.strip().lower()
+        if field not in LIMITS or not value.strip():
+            raise ValueError(f"Can't read {part.strip()!r}; write the profile like \"gpa=3.9, sat=1480, act=33\"")
+        values[field] = value.strip()
+    return make_student(**values)
+
+
+def load_students(path):
+    """(names, Students) from a CSV with Name, GPA, SAT and ACT columns (any may be blank)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        names, students = [], []
+        for line, row in enumerate(reader, start=2):
+            row = {key.strip().lower(): value for key, value in row.items() if key}
+            try:
+                students.append(make_student(row.get("gpa"), row.get("sat"), row.get("act")))
+            except ValueError as e:
+                raise ValueError(f"{path} line {line}: {e}")
+            names.append((row.get("name") or "").strip() or f"Student {len(names) + 1}")
+    return names, students
+
+
+# === CLASSIFICATION ===
+
+def _school_numbers(school):
+    return (school.sat_low, school.sat_high, school.act_low, school.act_high, school.avg_gpa,
+            school.acceptance_rate)
+
+
+def _test_level(score, low, high):
+    if score is None or low is None or high is None:
+        return None
+    return 0 if score >= high else 1 if score >= low else 2
+
+
+def _level(student, numbers):
+    """0/1/2 for Likely/Target/Reach, or None if there is nothing to compare"""
+    sat_low, sat_high, act_low, act_high, avg_gpa, rate = numbers
+    tests = [level for level in (_test_level(student.sat, sat_low, sat_high),
+                                 _test_level(student.act, act_low, act_high)) if level is not None]
+    gpa_known = student.gpa is not None and avg_gpa is not None
+    if tests:
+        level = min(tests)
+        if gpa_known and student.gpa < avg_gpa - GPA_MARGIN:
+            level = min(level + 1, 2)
+    elif gpa_known:
+        level = 0 if student.gpa >= avg_gpa + GPA_MARGIN else 1 if student.gpa >= avg_gpa - GPA_MARGIN else 2
+    else:
+        return None
+    if rate is not None:
+        level = max(level, 2 if rate < SELECTIVE_RATE else 1 if rate < COMPETITIVE_RATE else 0)
+    return level
+
+
+def _label(level):
+    return UNKNOWN if level is None else LABELS[level]
+
+
+def _classify_python(students, schools):
+    numbers = [_school_numbers(school) for school in schools]
+    return [[_label(_level(student, school)) for school in numbers] for student in students]
+
+
+def _classify_numpy(np, students, schools):
+    nan = float("nan")
+    column = lambda values: np.array([nan if value is None else value for value in values], dtype=float)
+    # Students down, schools across
+    student = {field: column(getattr(s, field) for s in students)[:, None] for field in Student._fields}
+    sat_low, sat_high, act_low, act_high, avg_gpa, rate = (column(values)[None, :]
+                                                           for values in zip(*map(_school_numbers, schools)))
+
+    def test_level(score, low, high):
+        level = np.where(score >= high, 0.0, np.where(score >= low, 1.0, 2.0))
+        return np.where(np.isnan(score) | np.isnan(low) | np.isnan(high), nan, level)
+
+    with np.errstate(invalid="ignore"):
+        # fmin skips NaN, so a missing SAT or ACT falls back to the other
+        tests = np.fmin(test_level(student["sat"], sat_low, sat_high), test_level(student["act"], act_low, act_high))
+        gpa = student["gpa"]
+        gpa_known = ~(np.isnan(gpa) | np.isnan(avg_gpa))
+        low_gpa = gpa_known & (gpa < avg_gpa - GPA_MARGIN)
+        gpa_level = np.where(gpa >= avg_gpa + GPA_MARGIN, 0.0, np.where(gpa >= avg_gpa - GPA_MARGIN, 1.0, 2.0))
+
+        level = np.where(np.isnan(tests), np.where(gpa_known, gpa_level, nan), np.minimum(tests + low_gpa, 2.0))
+        cap = np.where(rate < SELECTIVE_RATE, 2.0, np.where(rate < COMPETITIVE_RATE, 1.0, 0.0))
+        # maximum keeps NaN, so unknown pairs stay unknown
+        level = np.maximum(level, cap)
+
+    labels = np.array(LABELS + (UNKNOWN,), dtype=object)
+    return labels[np.where(np.isnan(level), 3, level).astype(int)].tolist()
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def classify(students, schools, vectorized=None):
+    """
+    Likely/Target/Reach for every student against every school (SchoolRecords), as one list
+    of labels per student in schools order. vectorized=None uses NumPy if it's installed.
+    """
+    students, schools = list(students), list(schools)
+    if not students or not schools:
+        return [[] for _ in students]
+    np = _numpy() if vectorized is not False else None
+    if vectorized and np is None:
+        raise ImportError("Vectorized classification needs numpy installed")
+    if np is not None:
+        return _classify_numpy(np, students, schools)
+    return _classify_python(students, schools)
+
+
+def fill(student, records):
+    """
+    Copies of records (None stays None) with the Likely/Target/Reach column, where there is
+    one, set for student. Copies, because the result cache and single-flight share records.
+    """
+    copies = [record.narrow(record.columns) if record is not None else None for record in records]
+    to_fill = [record for record in copies if record is not None and "Likely/Target/Reach" in record]
+    for record, label in zip(to_fill, classify([student], to_fill)[0]):
+        record.likely_target_reach = label
+    return copies
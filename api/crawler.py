@@ -0,0 +1,72 @@
+"""
+Scrape every school in the directory index (or a given list) into a new snapshot version.
+
+    python crawler.py                          every school in school_index.json
+    python crawler.py --schools "ucla, duke"   just these
+    python crawler.py --file schools.txt       one school per line
+    python crawler.py --resume                 continue the last unfinished crawl
+    python crawler.py --list                   show snapshot versions
+
+Each school is written as soon as it finishes, so an interrupted crawl can be resumed
+without re-scraping what is already saved.
+"""
+from data import Constants
+from scraper import ScrapeEngine
+from snapshot import Snapshot
+import school_index
+import argparse
+import os
+import time
+
+
+def crawl(schools, snapshot, engine, source, resume=False):
+    version = snapshot.begin(source, resume)
+    done = snapshot.done_schools(version)
+    todo = [school for school in schools if school not in done]
+    print(f"Snapshot v{version}: {len(done)} already saved, {len(todo)} to scrape")
+
+    found = 0
+    start = time.time()
+    for i, (index, extractor, data) in enumerate(engine.scrape_iter(todo, Constants.BOTH), start=1):
+        snapshot.add(version, todo[index], extractor.name, data)
+        found += 1 if data else 0
+        if i % 25 == 0 or i == len(todo):
+            print(f"  {i}/{len(todo)} scraped ({found} found, {time.time() - start:.0f}s)")
+
+    snapshot.finish(version)
+    print(f"✓ Snapshot v{version} finished")
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl collegedata into a local snapshot")
+    parser.add_argument("--schools", help="comma-separated schools (default: every school in the index)")
+    parser.add_argument("--file", help="file with one school per line")
+    parser.add_argument("--resume", action="store_true", help="continue the latest unfinished crawl")
+    parser.add_argument("--concurrency", type=int, default=8, help="schools scraped at the same time")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count(),
+                        help="processes parsing pages (0 to parse on the download threads)")
+    parser.add_argument("--list", action="store_true", help="list snapshot versions and exit")
+    args = parser.parse_args()
+
+    snapshot = Snapshot()
+    if args.list:
+        for version, source, started_at, finished_at, count in snapshot.versions():
+            state = time.strftime("%Y-%m-%d %H:%M", time.localtime(finished_at)) if finished_at else "unfinished"
+            print(f"  v{version}: {count} schools from {source} ({state})")
+        return
+
+    if args.schools:
+        schools, source = [school.strip() for school in args.schools.split(",")], "list"
+    elif args.file:
+        with open(args.file, encoding="utf-8") as f:
+            schools, source = [line.strip() for line in f if line.strip()], args.file
+    else:
+        schools, source = [school.name for school in school_index.get_index().schools], "index"
+
+    engine = ScrapeEngine(max_schools=args.concurrency, parse_workers=args.parse_workers)
+    crawl(schools, snapshot, engine, source, args.resume)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,488 +1,354 @@
-import requests
-from bs4 import BeautifulSoup
-import re
+import http_client
+import metrics
+import page_cache
+import school_index
+from field_specs import FIELD_SPECS, extract_field
+from page_index import PageIndex, parse
+from record import SchoolRecord
+from singleflight import SingleFlight
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+import threading
+import time
+import os
 
 class Constants:
     ACT = 1
     SAT = 2
     BOTH = 3
 
-# School name mappings
-SCHOOL_NAME_MAP = {
-    "ucla": "University of California Los Angeles",
-    "uclosangeles": "University of California Los Angeles",
-    "ucb": "University of California Berkeley",
-    "ucberkeley": "University of California Berkeley",
-    "berkeley": "University of California Berkeley",
-    "ucsb": "University of California Santa Barbara",
-    "ucsantabarbara": "University of California Santa Barbara",
-    "ucsd": "University of California San Diego",
-    "ucsandiego": "University of California San Diego",
-    "uci": "University of California Irvine",
-    "ucirvine": "University of California Irvine",
-    "ucd": "University of California Davis",
-    "ucdavis": "University of California Davis",
-    "ucsc": "University of California Santa Cruz",
-    "ucsantacruz": "University of California Santa Cruz",
-    "ucr": "University of California Riverside",
-    "ucriverside": "University of California Riverside",
-    "ucm": "University of California Merced",
-    "ucmerced": "University of California Merced",
-    "mizzou": "University of Missouri Columbia",
-    "unversityofmissouri": "University of Missouri Columbia",
-    "mit": "Massachusetts Institute of Technology",
-    "caltech": "California Institute of Technology",
-    "nyu": "New York University",
-    "usc": "University of Southern California",
-    "upenn": "University of Pennsylvania",
-    "penn": "University of Pennsylvania",
-    "pennstate": "Penn State University Park",
-    "psu": "Penn State University Park",
-    "upitt": "University of Pittsburgh",
-    "pitt": "University of Pittsburgh",
-    "washu": "Washington University in St. Louis",
-    "wustl": "Washington University in St. Louis",
-    "uva": "University of Virginia",
-    "umich": "University of Michigan",
-    "umichigan": "University of Michigan",
-    "michigan": "University of Michigan",
-    "umass": "University of Massachusetts Amherst",
-    "universityofmassachusetts": "University of Massachusetts Amherst",
-    "indiana": "Indiana University Bloomington",
-    "iu": "Indiana University Bloomington",
-    "iowa": "University of Iowa",
-    "unc": "University of North Carolina at Chapel Hill",
-    "universityofnorthcarolina": "University of North Carolina at Chapel Hill",
-    "uchicago": "University of Chicago",
-    "chicago": "University of Chicago",
-    "gt": "Georgia Institute of Technology",
-    "georgiatech": "Georgia Institute of Technology",
-    "uga": "University of Georgia",
-    "smu": "Southern Methodist University",
-    "uiuc": "University of Illinois at Urbana-Champaign",
-    "illinois": "University of Illinois at Urbana-Champaign",
-    "universityofillinois": "University of Illinois at Urbana-Champaign",
-    "uofi": "University of Illinois at Urbana-Champaign",
-    "utaustin": "University of Texas at Austin",
-    "universityoftexas": "University of Texas at Austin",
-    "austin": "University of Texas at Austin",
-    "texas": "University of Texas at Austin",
-    "tcu": "Texas Christian University",
-    "texaschristian": "Texas Christian University",
-    "uw": "University of Washington",
-    "uwashington": "University of Washington",
-    "cwru": "Case Western Reserve University",
-    "casewestern": "Case Western Reserve University",
-    "uwmadison": "University of Wisconsin Madison",
-    "wisconsin": "University of Wisconsin Madison",
-    "madison": "University of Wisconsin Madison",
-    "universityofwisconsin": "University of Wisconsin Madison",
-    "minnesota": "University of Minnesota Twin Cities",
-    "universityofminnesota": "University of Minnesota Twin Cities",
-    "minn": "University of Minnesota Twin Cities",
-    "virginiatech": "Virginia Polytechnic Institute and State University",
-    "vatech": "Virginia Polytechnic Institute and State University",
-    "loyola": "Loyola University Chicago",
-    "mohio": "Miami University",
-    "miamiohio": "Miami University",
-    "miamiofohio": "Miami University",
-    "miamiu": "Miami University",
-    "umiami": "University of Miami",
-    "miamiflorida": "University of Miami",
-    "umiami": "University of Miami",
-    "osu": "Ohio State University",
-    "theohiostate": "Ohio State University",
-    "msu": "Michigan State University",
-    "uofsc": "University of South Carolina",
-    "gwu": "George Washington University",
-    "gw": "George Washington University",
-    "boulder": "University of Colorado Boulder",
-    "colorado": "University of Colorado Boulder",
-    "cuboulder": "University of Colorado Boulder",
-    "coloradocollege": "Colorado College",
-    "costate": "Colorado State University",
-    "iowastate": "Iowa State University",
-    "tulane": "Tulane University",
-    "isu": "Illinois State University",
-    "duke": "Duke University",
-    "northwestern": "Northwestern University",
-    "northeastern": "Northeastern University",
-    "jhu": "Johns Hopkins University",
-    "vanderbilt": "Vanderbilt University",
-    "cmu": "Carnegie Mellon University",
-    "notredame": "University of Notre Dame",
-    "emory": "Emory University",
-    "georgetown": "Georgetown University",
-    "uf": "University of Florida",
-    "bu": "Boston University",
-    "bc": "Boston College",
-    "tufts": "Tufts University",
-    "rutgers": "Rutgers The State University of New Jersey",
-    "umd": "University of Maryland College Park",
-    "lehigh": "Lehigh University",
-    "purdue": "Purdue University",
-    "rochester": "University of Rochester",
-    "floraidastate": "Florida State University",
-    "fsu": "Florida State University",
-    "texasa&m": "Texas A&M University",
-    "wakeforest": "Wake Forest University",
-    "williamandmary": "College of William and Mary",
-    "rice": "Rice University",
-    "columbia": "Columbia University",
-    "dartmouth": "Darthmouth College",
-    "brown": "Brown University",
-    "cornell": "Cornell University",
-    "yale": "Yale University",
-    "stanford": "Stanford University",
-    "harvard": "Harvard University",
-    "princeton": "Princeton University",
-    "uic": "University of Illinois at Chicago",
-    "asu" : "Arizona State University",
-    "tennessee": "The University of Tennessee at Knoxville",
-    "oklahomastate": "Oklahoma State University Stillwater",
-    "southcarolina": "University of South Carolina",
-    "texasamuniversity" : "Texas A M University"
+def normalize_school_name(name):
+    """Convert user input (abbreviation, alias or typo) to the official school name"""
+    school = school_index.get_index().resolve(name)
+    return school.name if school else name.strip()
+
+# Overridable so the scraper can run against bench/replay_server.py instead of collegedata
+SEARCH_URL = os.environ.get("UFIT_SEARCH_URL", "https://waf.collegedata.com/college-search")
+
+# "sequential" stops at the first matching URL pattern (usually one request);
+# "concurrent" probes every pattern at once, trading requests for latency
+PROBE_MODE = "sequential"
+NOT_FOUND_STATUSES = (404, 410)
+_probe_pool = ThreadPoolExecutor(max_workers=8)
+
+# Concurrent fetches of the same URL (from any Extractor) share one request
+page_flights = SingleFlight()
+
+# Subpages scraped for each school, keyed by page name -> path suffix
+PAGES = {
+    "base": "",
+    "admission": "/admission",
+    "money-matters": "/money-matters",
+    "students": "/students",
+    "campus-life": "/campus-life",
 }
 
+# Output columns in the order they are scraped, with the subpages each is read from
+# (how each one is read is in field_specs.FIELD_SPECS)
+FIELDS = {column: (field.page,) if field.page else () for column, field in FIELD_SPECS.items()}
+TEST_COLUMNS = {
+    Constants.ACT: ["ACT Range"],
+    Constants.SAT: ["SAT Range"],
+    Constants.BOTH: ["SAT Range", "ACT Range"],
+}
 
-def normalize_school_name(name):
-    """Convert user input to the official school name"""
-    name_lower = name.strip().lower().replace(" ", "").replace("-", "").replace("&", "")
-    return SCHOOL_NAME_MAP.get(name_lower, name.strip())
-
-OOS_ACCEPTANCE_RATE =  {
-        "University Of Wisconsin Madison": "40.33",
-        "University Of Colorado Boulder": "66.68",
-        "University Of Virginia": "12.91",
-        "University Of North Carolina At Chapel Hill": "10.93",
-        "The University Of Tennessee At Knoxville": "35.08",
-        "University Of Washington": "36.20",
-        "Georgia Institute Of Technology": "10.12",
-        "University Of Texas At Austin": "10.13",
-        "Florida State University": "13.36",
-        "Purdue University": "43.58",
-        "University Of South Carolina": "54.72",
-        "University Of Georgia": "31.10",
-        "University Of California Berkeley": "10.33"
-    }
+def get_columns(test_pref, fields=None):
+    """Columns to scrape: the test columns for test_pref, narrowed to fields if given ("University" is always kept)"""
+    test_columns = TEST_COLUMNS.get(test_pref, TEST_COLUMNS[Constants.BOTH])
+    return [column for column in FIELDS
+            if (column not in ("SAT Range", "ACT Range") or column in test_columns)
+            and (fields is None or column in fields or column == "University")]
+
+def pages_for(columns):
+    """The minimal set of subpages needed for columns, in PAGES order (base first)"""
+    needed = {page for column in columns for page in FIELDS[column]}
+    return [page for page in PAGES if page in needed] or ["base"]
+
+def resolve_known(school_name):
+    """
+    (name, name_url) for a school resolved by the directory index or the slug cache,
+    (name, None) for a remembered miss, or None if it has to be probed. Never fetches.
+    """
+    name = normalize_school_name(school_name).title()
+    # Schools confirmed by the directory crawl need no probing at all
+    school = school_index.get_index().lookup(name)
+    if school and school.slug:
+        return name, school.slug
+
+    resolved = page_cache.get_cache().lookup_slug(name.lower())
+    if resolved is None:
+        return None
+    display_name, name_url = resolved
+    return (display_name or name), name_url
 
 class Extractor():
-    def __init__(self, school_name: str):
+    def __init__(self, school_name: str, limiter=None):
+        self._init_state(school_name, limiter)
+        # Try to find a valid URL
+        self.name, self.name_url, self.base_url = self._find_valid_url()
+
+    def _init_state(self, school_name, limiter):
         # Normalize the name first using the mapping
         self.original_name = school_name.strip()
         self.name = normalize_school_name(self.original_name).title()
         self.headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
         self._error_logged = False
-        # Try to find a valid URL
-        self.name, self.name_url, self.base_url = self._find_valid_url()
+        # Label indexes of parsed subpages, fetched at most once per school
+        self._pages = {}
+        # Raw HTML already downloaded but not parsed yet (e.g. the winning URL probe)
+        self._html = {}
+        # Number of HTTP requests issued for this school
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+        # url -> timings and outcome of each page fetched for this school (see page_trace)
+        self.trace = {}
+        # Wall-clock seconds for the whole scrape, set by ScrapeEngine
+        self.scrape_seconds = None
+        # Optional callable returning a context manager that holds a request slot for a URL
+        self._limiter = limiter
+
+    def _url_candidates(self):
+        """Names to try, in priority order, paired with their URL slugs"""
+        names = [
+            self.name,                      # the normalized name
+            f"{self.name} University",      # "university" at the end
+            f"University of {self.name}",   # "University of" at the beginning
+            f"{self.name} College",         # "[Name] College"
+        ]
+        return [(name, name.lower().replace(" ", "-").replace(".", "")) for name in names]
 
     def _find_valid_url(self):
         """Try different URL patterns to find a valid school page"""
-        # Try the normalized name first
-        name_url = self.name.lower().replace(" ", "-").replace(".", "")
-        base_url = f"https://waf.collegedata.com/college-search/{name_url}"
-        
-        if self._check_url_valid(base_url):
-            return self.name, name_url, base_url
-        
-        # Try adding "university" at the end
-        name_with_univ = f"{self.name} University"
-        name_url = name_with_univ.lower().replace(" ", "-").replace(".", "")
-        base_url = f"https://waf.collegedata.com/college-search/{name_url}"
-        
-        if self._check_url_valid(base_url):
-            return name_with_univ, name_url, base_url
-        
-        # Try adding "University of" at the beginning
-        name_univ_of = f"University of {self.name}"
-        name_url = name_univ_of.lower().replace(" ", "-").replace(".", "")
-        base_url = f"https://waf.collegedata.com/college-search/{name_url}"
-        
-        if self._check_url_valid(base_url):
-            return name_univ_of, name_url, base_url
-        
-        # Try "[Name] College"
-        name_with_college = f"{self.name} College"
-        name_url = name_with_college.lower().replace(" ", "-").replace(".", "")
-        base_url = f"https://waf.collegedata.com/college-search/{name_url}"
-        
-        if self._check_url_valid(base_url):
-            return name_with_college, name_url, base_url
-        
+        known = self._known_url()
+        if known:
+            return known
+
+        candidates = self._url_candidates()
+        if PROBE_MODE == "concurrent":
+            responses = _probe_pool.map(lambda candidate: self._probe(candidate[1]), candidates)
+        else:
+            # Lazy, so we stop probing at the first hit
+            responses = (self._probe(name_url) for _, name_url in candidates)
+        return self._choose_url(candidates, responses)
+
+    def _known_url(self):
+        """(name, name_url, base_url) from the directory index or the slug cache, or None if it must be probed"""
+        resolved = resolve_known(self.name)
+        if resolved is None:
+            return None
+        name, name_url = resolved
+        if name_url is not None:
+            return name, name_url, f"{SEARCH_URL}/{name_url}"
+        # Known miss: skip the probes and the base page fetch
+        self._pages["base"] = None
+        fallback = self._fallback_url()
+        self.base_url = fallback[2]
+        self._url_error_handling(self.base_url, error="not found on collegedata")
+        return fallback
+
+    def _fallback_url(self):
+        fallback_url = self.name.lower().replace(" ", "-").replace(".", "")
+        return self.name, fallback_url, f"{SEARCH_URL}/{fallback_url}"
+
+    def _choose_url(self, candidates, responses):
+        """Pick the first candidate whose probe returned 200, remembering the result in the slug cache"""
+        cache = page_cache.get_cache()
+        key = self.name.lower()
+        statuses = []
+        for (name, name_url), r in zip(candidates, responses):
+            statuses.append(r.status_code if r is not None else None)
+            if r is not None and r.status_code == 200:
+                # Keep the winning page so get_full_data doesn't fetch it again
+                self._html["base"] = r.text
+                cache.store_slug(key, name, name_url)
+                # Rows saved from this scrape carry the display name, so it has to resolve too
+                if name.lower() != key:
+                    cache.store_slug(name.lower(), name, name_url)
+                return name, name_url, f"{SEARCH_URL}/{name_url}"
+
+        # Only remember the miss if every pattern was a definite "not found"
+        if all(status in NOT_FOUND_STATUSES for status in statuses):
+            cache.store_slug(key, None, None)
+
         # If nothing works, return the original
-        name_url = self.name.lower().replace(" ", "-").replace(".", "")
-        base_url = f"https://waf.collegedata.com/college-search/{name_url}"
-        return self.name, name_url, base_url
-    
-    def _check_url_valid(self, url):
-        """Check if a URL returns a valid response without creating soup"""
+        return self._fallback_url()
+
+    def _probe(self, name_url):
+        """Fetch a candidate base page; returns None on connection errors"""
         try:
-            r = requests.get(url, headers=self.headers, timeout=5)
-            return r.status_code == 200
-        except:
-            return False
+            return self._fetch(f"{SEARCH_URL}/{name_url}", "base", timeout=5)
+        except Exception:
+            return None
 
-    def get_full_data(self, test_pref):
-        # Test if base URL exists first
-        soup = self._get_soup(self.base_url)
-        if soup is None:
+    def get_full_data(self, test_pref, fields=None):
+        """
+        Scrape the columns for test_pref, or only those also listed in fields, into a SchoolRecord.
+        Only the subpages those columns are read from get fetched.
+        """
+        columns = get_columns(test_pref, fields)
+        pages = pages_for(columns)
+        # Test if the school exists first, using a page we need anyway
+        if not self._check_exists(pages):
             return None  # School not found, skip entirely
 
-        data = {"University": self.name}
-        data["Location"] = self.get_location()
-        data["Number of Undergraduates"] = self.get_undergrad_count()
+        return SchoolRecord.from_row({column: self.extract(column) for column in columns})
 
-        # Admission data
-        data["Test Policy"] = self.get_test_policy()
-        data["Avg GPA"] = self.get_avg_gpa()
+    def get_full_data_pooled(self, test_pref, fields, fetch_executor, parse_pool):
+        """
+        get_full_data() with parsing moved off this process: pages are downloaded on
+        fetch_executor (threads) and each one is parsed and read by extract_page on
+        parse_pool (a process pool), which only sends back that page's values.
+        """
+        columns = get_columns(test_pref, fields)
+        pages = pages_for(columns)
+        html = self.fetch_html(fetch_executor, pages)
+        if html is None:
+            return None
 
-        if test_pref == Constants.ACT:
-            data["ACT Range"] = self.get_act_range()
-        elif test_pref == Constants.SAT:
-            data["SAT Range"] = self.get_sat_range()
-        else:
-            data["SAT Range"] = self.get_sat_range()
-            data["ACT Range"] = self.get_act_range()
-
-        data["Acceptance Rate"] = self.get_acceptance_rate()
-        
-        # Money data
-        data["Cost of Attendance"] = self.get_total_cost()
-        data["Merit Aid"] = self.get_merit_aid_no_need()
-        data["Likely/Target/Reach"] = " " #placeholder
-        data["ED/EA/Rolling"] = self.get_early_options()
-        data["Application Deadlines"] = self.get_application_deadlines()
-        return data
-
-    # === ADMISSION PAGE EXTRACTORS ===
-    
-    def get_test_policy(self):
-        soup = self._get_soup(f"{self.base_url}/admission")
-        if soup: 
-            test_policy = self._get_div_value(soup, "SAT or ACT")
-            if test_policy.strip().lower() == "considered if submitted":
-                return "optional"
-            else:
-                return test_policy
-        else:
-            return "N/A"
-    
-    def get_sat_range(self):
-        soup = self._get_soup(f"{self.base_url}")
-        if not soup:
-            return "N/A"
-        
-        # Extract SAT Math range
-        math_range = self._get_sat_section_range(soup, "SAT Math")
-        ebrw_range = self._get_sat_section_range(soup, "SAT EBRW")
-        
-        if math_range == "N/A" or ebrw_range == "N/A":
-            return "N/A"
-        
-        # Parse the ranges (e.g., "770-800" -> (770, 800))
-        math_match = re.search(r'(\d+)-(\d+)', math_range)
-        ebrw_match = re.search(r'(\d+)-(\d+)', ebrw_range)
-        
-        if not math_match or not ebrw_match:
-            return "N/A"
-        
-        # Calculate composite range
-        math_low, math_high = int(math_match.group(1)), int(math_match.group(2))
-        ebrw_low, ebrw_high = int(ebrw_match.group(1)), int(ebrw_match.group(2))
-        
-        composite_low = math_low + ebrw_low
-        composite_high = math_high + ebrw_high
-        
-        return f"{composite_low}-{composite_high}"
-
-    def _get_sat_section_range(self, soup, section_name):
-        """Helper to extract SAT Math or SAT EBRW range"""
-        label_div = soup.find('div', string=re.compile(f"^{section_name}$", re.I))
-        if not label_div:
-            return "N/A"
-        
-        # Look through sibling divs for the range
-        current = label_div.find_next_sibling('div')
-        while current:
-            text = current.get_text(strip=True)
-            if 'range of middle 50%' in text.lower():
-                match = re.search(r'(\d+)-(\d+)', text)
-                return match.group(0) if match else "N/A"
-            current = current.find_next_sibling('div')
-        
-        return "N/A"
-    
-    def get_act_range(self):
-        soup = self._get_soup(f"{self.base_url}")
-        if not soup:
-            return "N/A"
-        
-        # Find the ACT Composite label
-        label_div = soup.find('div', string=re.compile(r"ACT Composite", re.I))
-        if not label_div:
-            return "N/A"
-        
-        # Look through all sibling divs to find the one with "range of middle 50%"
-        current = label_div.find_next_sibling('div')
-        while current:
-            text = current.get_text(strip=True)
-            if 'range of middle 50%' in text.lower():
-                # Extract just the range numbers (e.g., "33-35")
-                match = re.search(r'(\d+)-(\d+)', text)
-                return match.group(0) if match else text
-            current = current.find_next_sibling('div')
-        
-        return "N/A"
-    
-    def get_avg_gpa(self):
-        soup = self._get_soup(f"{self.base_url}")
-        return self._get_div_value(soup, "Average GPA") if soup else "N/A"
-
-    def get_acceptance_rate(self):
-        OOS = ""
-        if self.name in OOS_ACCEPTANCE_RATE:
-            OOS = f" ({OOS_ACCEPTANCE_RATE[self.name]}% OOS)"
-        soup = self._get_soup(f"{self.base_url}")
-        if not soup:
-            return "N/A"
-        rate = soup.find(string=re.compile(r'applicants were admitted', re.I))
-
-        return rate.strip().split("%")[0] + "%" + OOS if rate else "N/A"
-    
-    def get_early_decision(self):
-        soup = self._get_soup(f"{self.base_url}/admission")
-        return self._get_div_value(soup, "Early Decision Offered") if soup else "N/A"
-    
-    def get_early_action(self):
-        soup = self._get_soup(f"{self.base_url}/admission")
-        return self._get_div_value(soup, "Early Action Offered") if soup else "N/A"
-    
-    def get_early_options(self):
-        ea = self.get_early_action().strip()
-        ed = self.get_early_decision().strip()
-        if ea.strip() == "N/A" and ed.strip() == "N/A":
-            return "N/A"
-        elif ea != "No" and ed != "No":
-            return "ED, EA"
-        elif ea != "No":
-            return "EA"
-        elif ed != "No":
-            return "ED"
-        elif self.get_rolling():
-             return "Rolling"
-        else:
-            return "RD only"
-
-    def get_rolling(self):
-        soup = self._get_soup(f"{self.base_url}/admission")
-        if soup: 
-            reg = self._get_div_value(soup, "Regular Admission Deadline")
-            if reg.strip() == "Rolling":
-                return True
-            else: 
-                return False
-        else: return False
-
-    def get_total_cost(self):
-        soup = self._get_soup(f"{self.base_url}")
-        if not soup:
-            return "N/A"
-        else:
-            if self._get_div_value(soup, "In-state:") != "N/A": #means public school
-                if "Illinois" in self.name.split():
-                    return self._get_div_value(soup, "Cost of Attendance").replace("In-state: ", "")
-                else:
-                    return self._get_div_value(soup, "In-state:").replace("Out-of-state: ", "")
-            else:
-                return self._get_div_value(soup, "Cost of Attendance")
-
-        
-    # === MONEY MATTERS PAGE EXTRACTORS ===
-    
-    def get_merit_aid_no_need(self):
-        soup = self._get_soup(f"{self.base_url}/money-matters")
-        if not soup:
-            return "N/A"
-        
-        # Find the "Merit-Based Gift" label
-        label_div = soup.find('div', string=re.compile(r'Merit-Based Gift', re.I))
-        if not label_div:
-            return "N/A"
-        
-        # Look through sibling divs for the one about "no financial need"
-        current = label_div.find_next_sibling('div')
-        while current:
-            text = current.get_text(strip=True)
-            if 'no financial need' in text.lower() and 'merit aid' in text.lower():
-                text = re.sub(r"^\S+\s*", "", text)
-                text = text.replace("(", "").replace(")", "").replace("of freshmen had no financial need and ", "").replace("merit aid, average amount ", "")
-                return text
-            current = current.find_next_sibling('div')
-        
-        return "N/A"
-    
-    def get_undergrad_count(self):
-        soup = self._get_soup(f"{self.base_url}/students")
-        if not soup:
-            return "N/A"
-        
-        # Look for "All Undergraduates" label
-        label_div = soup.find('div', string=re.compile(r'All Undergraduates', re.I))
-        if not label_div:
-            return "N/A"
-        
-        # Get the next sibling div which contains the value
-        value_div = label_div.find_next_sibling('div')
-        if value_div:
-            return value_div.get_text(strip=True)
-        
-        return "N/A"
-    
-    def get_location(self):
-        soup = self._get_soup(f"{self.base_url}/campus-life")
-        if not soup:
-            return "N/A"
-        
-        # Look for Location in StatLine structure
-        label_div = soup.find('div', class_=re.compile(r'StatLine_label'), string=re.compile(r'Location', re.I))
-        if not label_div:
-            # Fallback to TitleValue structure
-            return self._get_div_value(soup, "Location")
-        
-        # Get the next sibling div with StatLine_value class
-        value_div = label_div.find_next_sibling('div', class_=re.compile(r'StatLine_value'))
-        if value_div:
-            return value_div.get_text(strip=True)
-        
-        return "N/A"
-
-    def get_application_deadlines(self):
-        soup = self._get_soup(f"{self.base_url}/admission")
-        if soup:
-            deadlines = {}
-            if self.get_early_decision() not in ["N/A", "No"]:
-                deadlines["ED"] = self._get_div_value(soup, "Early Decision Deadline")
-            if self.get_early_action() not in ["N/A", "No"]:
-                deadlines["EA"] = self._get_div_value(soup, "Early Action Deadline")
-            deadlines["RD"] = self._get_div_value(soup, "Regular Admission Deadline")
-            string = ""
-            for key in deadlines:
-                deadline = deadlines[key].split(', ')
-                deadline = deadline[0]
-                string += f"{key}: {deadline}, "
-            return string[:len(string)-2]
-        else:
-            return "N/A"
+        futures = [
+            (page, parse_pool.submit(extract_page, self.name, page, html[page],
+                                     [column for column in columns if FIELDS[column] == (page,)]))
+            for page in pages if html[page] is not None
+        ]
+        values = {}
+        for page, future in futures:
+            page_values, seconds = future.result()
+            self._record_parse(f"{self.base_url}{PAGES[page]}", page, seconds)
+            values.update(page_values)
+
+        # Pages that failed to download read as missing, like they do in get_full_data
+        self._pages.update({page: None for page in pages if html[page] is None})
+        return SchoolRecord.from_row({column: values[column] if column in values else self.extract(column)
+                                      for column in columns})
 
+    def extract(self, column):
+        """One column's cell text, fetching and parsing its page on first use"""
+        page = FIELD_SPECS[column].page
+        return extract_field(column, self._get_page(page) if page else None, self.name)
 
- 
     # === HELPER METHODS ===
 
-    def _get_soup(self, url):
+    def _get_page(self, page):
+        """Return the label index for a subpage, fetching and parsing it only on first use"""
+        if page not in self._pages:
+            self._pages[page] = self._load_page(page)
+        return self._pages[page]
+
+    def _load_page(self, page):
+        soup = self._get_soup(f"{self.base_url}{PAGES[page]}", page)
+        return PageIndex(soup) if soup is not None else None
+
+    def _check_exists(self, pages):
+        """Fetch the first page of the plan; if it (or a known-missing base page) is absent, so is the school"""
+        if "base" in self._pages and self._pages["base"] is None:
+            return False
+        return self._get_page(pages[0]) is not None
+
+    def prefetch(self, executor, pages=tuple(PAGES)):
+        """
+        Fetch the first of pages, then the rest in parallel on executor.
+        Returns False if the school could not be found.
+        """
+        if not self._check_exists(pages):
+            return False
+        missing = [page for page in pages if page not in self._pages]
+        for page, index in zip(missing, executor.map(self._load_page, missing)):
+            self._pages[page] = index
+        return True
+
+    def fetch_html(self, executor, pages=tuple(PAGES)):
+        """
+        Raw HTML of pages (None for pages that failed), fetching the first and then the rest
+        in parallel on executor. Returns None if the school could not be found.
+        """
+        if "base" in self._pages and self._pages["base"] is None:
+            return None
+        url = lambda page: f"{self.base_url}{PAGES[page]}"
+        first = self._get_html(url(pages[0]), pages[0])
+        if first is None:
+            return None
+        html = {pages[0]: first}
+        html.update(zip(pages[1:], executor.map(lambda page: self._get_html(url(page), page), pages[1:])))
+        return html
+
+    def _request_slot(self, url):
+        return self._limiter(url) if self._limiter else nullcontext()
+
+    def _count_request(self):
+        with self._count_lock:
+            self.request_count += 1
+
+    def _fetch(self, url, page, timeout=http_client.TIMEOUT):
+        """
+        Fetch a page through the on-disk page cache, only counting requests that hit the network.
+        If another Extractor is already fetching url, wait for its response instead.
+        """
+        network = {}
+        def network_get(extra_headers):
+            self._count_request()
+            with self._request_slot(url):
+                r = http_client.get(url, headers={**self.headers, **extra_headers}, timeout=timeout)
+            network["status"] = r.status_code
+            network["retries"] = _retry_count(r)
+            return r
+
+        start = time.perf_counter()
         try:
-            r = requests.get(url, headers=self.headers)
+            r = page_flights.do(url, lambda: page_cache.fetch(url, page, network_get))
+        except Exception as e:
+            self._record_fetch(url, page, time.perf_counter() - start, error=str(e))
+            raise
+        self._record_fetch(url, page, time.perf_counter() - start, r, _source(r, network), network.get("retries", 0))
+        return r
+
+    def _record_fetch(self, url, page, seconds, r=None, source=None, retries=0, error=None):
+        status = r.status_code if r is not None else "error"
+        size = len(r.text.encode("utf-8")) if r is not None else 0
+        self.trace[url] = {
+            "page": page, "url": url, "status": status, "source": source, "bytes": size,
+            "fetch_ms": round(seconds * 1000, 1), "parse_ms": None, "retries": retries, "error": error,
+        }
+        if error:
+            metrics.PAGE_ERRORS.inc(page=page)
+            return
+        metrics.PAGE_FETCH_SECONDS.observe(seconds, page=page, source=source)
+        metrics.PAGE_FETCHES.inc(page=page, source=source, status=status)
+        metrics.PAGE_BYTES.inc(size, source=source)
+        if retries:
+            metrics.HTTP_RETRIES.inc(retries, page=page)
+
+    def _parse(self, url, page, html):
+        start = time.perf_counter()
+        soup = parse(html)
+        self._record_parse(url, page, time.perf_counter() - start)
+        return soup
+
+    def _record_parse(self, url, page, seconds):
+        metrics.PAGE_PARSE_SECONDS.observe(seconds, page=page)
+        if url in self.trace:
+            self.trace[url]["parse_ms"] = round(seconds * 1000, 1)
+
+    def page_trace(self):
+        """Per-school instrumentation: request count, total time and one entry per page fetched"""
+        return {
+            "school": self.name,
+            "requests": self.request_count,
+            "seconds": round(self.scrape_seconds, 3) if self.scrape_seconds is not None else None,
+            "pages": list(self.trace.values()),
+        }
+
+    def _get_soup(self, url, page):
+        html = self._get_html(url, page)
+        return self._parse(url, page, html) if html is not None else None
+
+    def _get_html(self, url, page):
+        """The page's HTML, or None (after reporting it) if it could not be fetched"""
+        if page in self._html:
+            return self._html.pop(page)
+        try:
+            r = self._fetch(url, page)
             if r.status_code == 200:
-                return BeautifulSoup(r.text, 'html.parser')
+                return r.text
             else:
                 self._url_error_handling(url, r.status_code)
                 return None
@@ -501,27 +367,27 @@ class Extractor():
             print(f"  → Skipping this school\n")
             self._error_logged = True  # Mark that we've logged the error
 
-    def _get_div_value(self, soup, label_text):
-        """
-        Targeting the specific div structure:
-        <div class="TitleValue_title...">Label</div>
-        <div class="TitleValue_value...">Value</div>
-        """
-        label_div = soup.find('div', string=re.compile(f"^{label_text}$", re.I))
-        
-        if not label_div:
-            label_div = soup.find('div', string=re.compile(label_text, re.I))
-            
-        if label_div:
-            value_div = label_div.find_next_sibling('div')
-            if value_div:
-                return value_div.get_text(strip=True)
-        
-        # Fallback for table-based layouts
-        target = soup.find(['td', 'th'], string=re.compile(label_text, re.I))
-        if target:
-            sibling = target.find_next_sibling('td')
-            if sibling:
-                return sibling.get_text(strip=True)
-            
-        return "N/A"
\ No newline at end of file
+def extract_page(name, page, html, columns):
+    """
+    Parse one page and read columns (all found on that page) from it. Runs in a parse pool
+    worker process, so it returns just ({column: value}, parse seconds).
+    """
+    start = time.perf_counter()
+    index = PageIndex(parse(html))
+    seconds = time.perf_counter() - start
+    return {column: extract_field(column, index, name) for column in columns}, seconds
+
+def _source(r, network):
+    """Where a fetched page came from, given what network_get saw (nothing if it was never called)"""
+    if not network:
+        return "cache" if r.from_cache else "shared"
+    return "revalidated" if network["status"] == 304 else "network"
+
+def _retry_count(r):
+    """How many times the request behind r was retried (0 for responses without that history)"""
+    extensions = getattr(r, "extensions", None)
+    if extensions is not None:
+        # httpx responses from http_client.get_async
+        return extensions.get("retries", 0)
+    retries = getattr(getattr(r, "raw", None), "retries", None)
+    return len(getattr(retries, "history", None) or ())
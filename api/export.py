@@ -0,0 +1,45 @@
+"""
+Spreadsheet writers for /api/export.
+
+CSV and TSV are produced one row at a time so large exports are never held in memory;
+TSV pastes straight into Google Sheets. XLSX needs openpyxl, imported only when asked for.
+"""
+import csv
+import io
+
+FORMATS = {
+    # format -> (mimetype, file extension)
+    "csv": ("text/csv", "csv"),
+    "tsv": ("text/tab-separated-values", "tsv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+class _Line:
+    """File-like target for csv.writer that hands back the last written line"""
+
+    def write(self, line):
+        return line
+
+
+def iter_delimited(rows, fieldnames, delimiter=","):
+    """Yields the header, then one encoded line per row dict"""
+    writer = csv.writer(_Line(), delimiter=delimiter)
+    yield writer.writerow(fieldnames).encode("utf-8")
+    for row in rows:
+        yield writer.writerow([row.get(field, "") for field in fieldnames]).encode("utf-8")
+
+
+def xlsx_bytes(rows, fieldnames):
+    """The rows as an .xlsx workbook; raises ImportError if openpyxl is not installed"""
+    from openpyxl import Workbook
+
+    # write_only streams rows into the workbook instead of building a cell grid
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("College Data")
+    sheet.append(fieldnames)
+    for row in rows:
+        sheet.append([row.get(field, "") for field in fieldnames])
+    output = io.BytesIO()
+    workbook.save(output)
+    return output.getvalue()
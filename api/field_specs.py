@@ -0,0 +1,177 @@
+"""
+How each output column is read from collegedata's pages, as one table.
+
+Every column names the subpage it comes from, the label lookups it needs and a
+post-processor that turns the looked-up text into the cell. Lookups are built (labels
+lowercased, regexes compiled) once at import, and extract_field() is the single engine
+behind every column: it resolves the lookups against the page's PageIndex, which
+memoizes them, so columns sharing a label (ED/EA/Rolling and Application Deadlines)
+share the work. Adding a column means adding a row to FIELD_SPECS, not another pass
+over the page.
+"""
+from collections import namedtuple
+import re
+
+NA = "N/A"
+
+# How the value sits relative to its label (see PageIndex for the HTML each one covers)
+LAYOUTS = (
+    "value",      # div (or table cell) right after the label; "N/A" if missing
+    "next",       # div right after the label, no table fallback; "N/A" if missing
+    "siblings",   # first div after the label containing every needle; None if missing
+    "stat_line",  # StatLine_label / StatLine_value pair; None if the page doesn't use it
+    "phrase",     # first text node containing the label; None if missing
+)
+
+
+class Lookup(namedtuple("Lookup", "layout label needles match")):
+    """
+    One label lookup on a page. match is "exact" (whole div text), "contains", or
+    "either" (exact first, then the first div containing the label).
+    """
+    __slots__ = ()
+
+    def __new__(cls, layout, label, *needles, match="either"):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout}")
+        return super().__new__(cls, layout, label.lower(), tuple(needle.lower() for needle in needles), match)
+
+
+# page: the subpage read (None for columns that need no page); lookups: resolved in
+# order and passed to build(name, *texts) after the school's name
+Field = namedtuple("Field", "page lookups build")
+
+OOS_ACCEPTANCE_RATE =  {
+        "University Of Wisconsin Madison": "40.33",
+        "University Of Colorado Boulder": "66.68",
+        "University Of Virginia": "12.91",
+        "University Of North Carolina At Chapel Hill": "10.93",
+        "The University Of Tennessee At Knoxville": "35.08",
+        "University Of Washington": "36.20",
+        "Georgia Institute Of Technology": "10.12",
+        "University Of Texas At Austin": "10.13",
+        "Florida State University": "13.36",
+        "Purdue University": "43.58",
+        "University Of South Carolina": "54.72",
+        "University Of Georgia": "31.10",
+        "University Of California Berkeley": "10.33"
+    }
+
+RANGE = re.compile(r'(\d+)-(\d+)')
+LEADING_WORD = re.compile(r"^\S+\s*")
+
+ED_OFFERED = Lookup("value", "Early Decision Offered")
+EA_OFFERED = Lookup("value", "Early Action Offered")
+ED_DEADLINE = Lookup("value", "Early Decision Deadline")
+EA_DEADLINE = Lookup("value", "Early Action Deadline")
+RD_DEADLINE = Lookup("value", "Regular Admission Deadline")
+
+
+# === POST-PROCESSORS ===
+
+def _text(name, text):
+    return text
+
+def _location(name, stat_line, title_value):
+    # StatLine layout first, TitleValue as the fallback
+    return stat_line if stat_line is not None else title_value
+
+def _test_policy(name, test_policy):
+    if test_policy.strip().lower() == "considered if submitted":
+        return "optional"
+    return test_policy
+
+def _sat_range(name, math_text, ebrw_text):
+    # Composite range from the section ranges, e.g. "770-800" + "740-780" -> "1510-1580"
+    math_match = RANGE.search(math_text) if math_text is not None else None
+    ebrw_match = RANGE.search(ebrw_text) if ebrw_text is not None else None
+    if not math_match or not ebrw_match:
+        return NA
+    composite_low = int(math_match.group(1)) + int(ebrw_match.group(1))
+    composite_high = int(math_match.group(2)) + int(ebrw_match.group(2))
+    return f"{composite_low}-{composite_high}"
+
+def _act_range(name, text):
+    if text is None:
+        return NA
+    # Just the range numbers (e.g., "33-35")
+    match = RANGE.search(text)
+    return match.group(0) if match else text
+
+def _acceptance_rate(name, rate):
+    if not rate:
+        return NA
+    oos = f" ({OOS_ACCEPTANCE_RATE[name]}% OOS)" if name in OOS_ACCEPTANCE_RATE else ""
+    return rate.strip().split("%")[0] + "%" + oos
+
+def _cost(name, in_state, cost):
+    if in_state == NA:
+        return cost
+    # Public school
+    if "Illinois" in name.split():
+        return cost.replace("In-state: ", "")
+    return in_state.replace("Out-of-state: ", "")
+
+def _merit_aid(name, text):
+    if text is None:
+        return NA
+    text = LEADING_WORD.sub("", text)
+    return text.replace("(", "").replace(")", "").replace("of freshmen had no financial need and ", "").replace("merit aid, average amount ", "")
+
+def _early_options(name, ed, ea, regular):
+    ea = ea.strip()
+    ed = ed.strip()
+    if ea == NA and ed == NA:
+        return NA
+    elif ea != "No" and ed != "No":
+        return "ED, EA"
+    elif ea != "No":
+        return "EA"
+    elif ed != "No":
+        return "ED"
+    elif regular.strip() == "Rolling":
+        return "Rolling"
+    else:
+        return "RD only"
+
+def _deadlines(name, ed, ea, ed_deadline, ea_deadline, regular):
+    deadlines = {}
+    if ed not in [NA, "No"]:
+        deadlines["ED"] = ed_deadline
+    if ea not in [NA, "No"]:
+        deadlines["EA"] = ea_deadline
+    deadlines["RD"] = regular
+    return ", ".join(f"{key}: {deadline.split(', ')[0]}" for key, deadline in deadlines.items())
+
+
+# Output columns in the order they are scraped
+FIELD_SPECS = {
+    "University": Field(None, (), lambda name: name),
+    "Location": Field("campus-life", (Lookup("stat_line", "Location"), Lookup("value", "Location")), _location),
+    "Number of Undergraduates": Field("students", (Lookup("next", "All Undergraduates", match="contains"),), _text),
+    # Admission data
+    "Test Policy": Field("admission", (Lookup("value", "SAT or ACT"),), _test_policy),
+    "Avg GPA": Field("base", (Lookup("value", "Average GPA"),), _text),
+    "SAT Range": Field("base", (Lookup("siblings", "SAT Math", "range of middle 50%", match="exact"),
+                                Lookup("siblings", "SAT EBRW", "range of middle 50%", match="exact")), _sat_range),
+    "ACT Range": Field("base", (Lookup("siblings", "ACT Composite", "range of middle 50%", match="contains"),), _act_range),
+    "Acceptance Rate": Field("base", (Lookup("phrase", "applicants were admitted"),), _acceptance_rate),
+    # Money data
+    "Cost of Attendance": Field("base", (Lookup("value", "In-state:"), Lookup("value", "Cost of Attendance")), _cost),
+    "Merit Aid": Field("money-matters", (Lookup("siblings", "Merit-Based Gift", "no financial need", "merit aid",
+                                                match="contains"),), _merit_aid),
+    "Likely/Target/Reach": Field(None, (), lambda name: " "), #placeholder
+    "ED/EA/Rolling": Field("admission", (ED_OFFERED, EA_OFFERED, RD_DEADLINE), _early_options),
+    "Application Deadlines": Field("admission", (ED_OFFERED, EA_OFFERED, ED_DEADLINE, EA_DEADLINE, RD_DEADLINE),
+                                   _deadlines),
+}
+
+
+def extract_field(column, page, name):
+    """Cell text for column, given the PageIndex of its page (None if that page is missing)"""
+    field = FIELD_SPECS[column]
+    if field.page is None:
+        return field.build(name)
+    if page is None:
+        return NA
+    return field.build(name, *(page.find(lookup) for lookup in field.lookups))
@@ -0,0 +1,146 @@
+import threading
+import time
+
+# Defaults for the shared session
+POOL_SIZE = 16         # keep-alive connections kept per host
+TIMEOUT = 10           # seconds, used when a caller does not pass one
+RETRIES = 3            # retries on 429/5xx and connection errors
+BACKOFF_FACTOR = 0.5   # sleeps 0.5s, 1s, 2s, ... between retries
+RATE_LIMIT = 20        # requests per second across the process (None to disable)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """Token bucket shared by every thread in the process"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token and return 0, or return how many seconds to wait before trying again"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent"""
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire() that yields to the event loop while waiting"""
+        import asyncio
+
+        while True:
+            wait = self.reserve()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+def _build_session(pool_size, retries, backoff_factor):
+    # Imported here so routes that never fetch (/, /api/test) don't load requests on a cold start
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    class RateLimitedRetry(Retry):
+        """Retry that takes a rate-limit token before every retry, like get_async does"""
+
+        def sleep(self, response=None):
+            super().sleep(response)
+            if _rate_limiter:
+                _rate_limiter.acquire()
+
+    retry = RateLimitedRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["GET", "HEAD"],
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the final 429/5xx back to the caller
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = None
+_rate_limiter = RateLimiter(RATE_LIMIT) if RATE_LIMIT else None
+_session_lock = threading.Lock()
+
+
+def configure(pool_size=POOL_SIZE, retries=RETRIES, backoff_factor=BACKOFF_FACTOR, rate_limit=RATE_LIMIT):
+    """Replace the process-wide session, e.g. to raise the pool size for a large batch"""
+    global _session, _rate_limiter
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = _build_session(pool_size, retries, backoff_factor)
+        _rate_limiter = RateLimiter(rate_limit) if rate_limit else None
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(POOL_SIZE, RETRIES, BACKOFF_FACTOR)
+    return _session
+
+
+def get(url, headers=None, timeout=TIMEOUT):
+    """GET through the shared session, honoring the client-side rate limit"""
+    if _rate_limiter:
+        _rate_limiter.acquire()
+    return get_session().get(url, headers=headers, timeout=timeout)
+
+
+# === ASYNC (httpx, imported only when used) ===
+
+def async_client(pool_size=POOL_SIZE, timeout=TIMEOUT):
+    """A new httpx.AsyncClient for one event loop; close it with "async with" """
+    import httpx
+
+    limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+    return httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True)
+
+
+async def get_async(client, url, headers=None, timeout=TIMEOUT):
+    """
+    GET through an httpx.AsyncClient with the same rate limit and 429/5xx retry policy as get().
+    The number of retries is left in response.extensions["retries"].
+    """
+    import asyncio
+    import httpx
+
+    for attempt in range(RETRIES + 1):
+        if _rate_limiter:
+            await _rate_limiter.acquire_async()
+        try:
+            r = await client.get(url, headers=headers, timeout=timeout)
+        except httpx.TransportError:
+            if attempt == RETRIES:
+                raise
+            await asyncio.sleep(BACKOFF_FACTOR * 2 ** attempt)
+            continue
+        if r.status_code not in RETRY_STATUSES or attempt == RETRIES:
+            r.extensions["retries"] = attempt
+            return r
+        retry_after = r.headers.get("Retry-After", "")
+        await asyncio.sleep(float(retry_after) if retry_after.isdigit() else BACKOFF_FACTOR * 2 ** attempt)
@@ -0,0 +1,215 @@
+"""
+Background scrape jobs for school lists too long to answer in one request.
+
+A job is stored in SQLite with one row per school, so progress and partial results
+survive between polls, and resuming a job only re-queues the schools that were not
+scraped successfully. Jobs run on a thread pool inside the web process, so they need
+a long-lived server (gunicorn, flask run) rather than a serverless function.
+Results of /api/schools are saved the same way, as finished jobs, so they can be
+exported by ID without the browser uploading them again. Both are deleted RESULT_TTL
+after they were created.
+"""
+from record import SchoolRecord
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+JOBS_PATH = os.environ.get("UFIT_JOBS_PATH", os.path.join(tempfile.gettempdir(), "ufit_jobs.sqlite3"))
+JOB_WORKERS = 4
+# Finished jobs and saved /api/schools results are deleted this long after they were created
+RESULT_TTL = 24 * 60 * 60
+PRUNE_INTERVAL = 10 * 60
+
+# Per-school states; "done", "skipped" and "failed" are final until the job is resumed
+PENDING, RUNNING, DONE, SKIPPED, FAILED = "pending", "running", "done", "skipped", "failed"
+RESUMABLE = (PENDING, RUNNING, SKIPPED, FAILED)
+
+
+class JobStore:
+    """SQLite persistence for jobs and their per-school results"""
+
+    def __init__(self, path=JOBS_PATH, ttl=RESULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._pruned_at = 0
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    test_pref INTEGER,
+                    created_at REAL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_schools (
+                    job_id TEXT,
+                    idx INTEGER,
+                    school TEXT,
+                    status TEXT,
+                    data TEXT,
+                    error TEXT,
+                    PRIMARY KEY (job_id, idx)
+                )
+            """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, schools, test_pref):
+        job_id = uuid.uuid4().hex
+        with self._conn() as conn:
+            conn.execute("INSERT INTO jobs VALUES (?, ?, ?)", (job_id, test_pref, time.time()))
+            conn.executemany(
+                "INSERT INTO job_schools VALUES (?, ?, ?, ?, NULL, NULL)",
+                [(job_id, i, school, PENDING) for i, school in enumerate(schools)],
+            )
+        return job_id
+
+    def save(self, results, test_pref):
+        """Store an already scraped list of (school, data) as a finished job, so it can be exported by ID"""
+        if time.time() - self._pruned_at >= PRUNE_INTERVAL:
+            self.prune()
+        job_id = uuid.uuid4().hex
+        with self._conn() as conn:
+            conn.execute("INSERT INTO jobs VALUES (?, ?, ?)", (job_id, test_pref, time.time()))
+            conn.executemany(
+                "INSERT INTO job_schools VALUES (?, ?, ?, ?, ?, NULL)",
+                [(job_id, i, school, DONE if data else SKIPPED, json.dumps(data.to_json()) if data else None)
+                 for i, (school, data) in enumerate(results)],
+            )
+        return job_id
+
+    def prune(self):
+        """Delete jobs older than the TTL that have no school still pending or running; returns how many"""
+        self._pruned_at = time.time()
+        with self._conn() as conn:
+            expired = [job_id for job_id, in conn.execute("""
+                SELECT id FROM jobs WHERE created_at < ? AND NOT EXISTS (
+                    SELECT 1 FROM job_schools WHERE job_id = jobs.id AND status IN (?, ?)
+                )
+            """, (time.time() - self.ttl, PENDING, RUNNING))]
+            conn.executemany("DELETE FROM job_schools WHERE job_id = ?", [(job_id,) for job_id in expired])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in expired])
+        return len(expired)
+
+    def test_pref(self, job_id):
+        row = self._conn().execute("SELECT test_pref FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_status(self, job_id, idx, status, data=None, error=None):
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE job_schools SET status = ?, data = ?, error = ? WHERE job_id = ? AND idx = ?",
+                (status, json.dumps(data.to_json()) if data is not None else None, error, job_id, idx),
+            )
+
+    def schools(self, job_id, statuses=None):
+        """Returns [(idx, school, status, data, error)] in input order"""
+        rows = self._conn().execute(
+            "SELECT idx, school, status, data, error FROM job_schools WHERE job_id = ? ORDER BY idx", (job_id,)
+        ).fetchall()
+        return [(idx, school, status, SchoolRecord.from_json(json.loads(data)) if data else None, error)
+                for idx, school, status, data, error in rows
+                if statuses is None or status in statuses]
+
+    def columns(self, job_ids):
+        """Every column held by any finished row of the jobs, so an export's header can cover them all"""
+        columns = set()
+        for job_id in job_ids:
+            cursor = self._conn().execute(
+                "SELECT data FROM job_schools WHERE job_id = ? AND status = ?", (job_id, DONE)
+            )
+            for data, in cursor:
+                obj = json.loads(data)
+                # Rows saved before records existed are plain {column: text} dicts
+                columns.update(obj["columns"] if "values" in obj else obj)
+        return columns
+
+    def iter_data(self, job_ids):
+        """Yields the SchoolRecords of each job in turn, in input order, without loading them all at once"""
+        for job_id in job_ids:
+            cursor = self._conn().execute(
+                "SELECT data FROM job_schools WHERE job_id = ? AND status = ? ORDER BY idx", (job_id, DONE)
+            )
+            for data, in cursor:
+                yield SchoolRecord.from_json(json.loads(data))
+
+
+class JobManager:
+    """Runs jobs on a background worker pool and reports their progress"""
+
+    def __init__(self, engine, store=None, workers=JOB_WORKERS):
+        self.engine = engine
+        self.store = store or JobStore()
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        # (job_id, idx) queued or running in this process, so resume doesn't duplicate them
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def submit(self, schools, test_pref):
+        job_id = self.store.create(schools, test_pref)
+        self._enqueue(job_id, [(idx, school) for idx, school, *_ in self.store.schools(job_id)])
+        return job_id
+
+    def resume(self, job_id):
+        """Re-queue schools that were skipped, failed or interrupted; returns how many, or None"""
+        if self.store.test_pref(job_id) is None:
+            return None
+        todo = [(idx, school) for idx, school, *_ in self.store.schools(job_id, RESUMABLE)]
+        return self._enqueue(job_id, todo)
+
+    def _enqueue(self, job_id, todo):
+        test_pref = self.store.test_pref(job_id)
+        queued = 0
+        for idx, school in todo:
+            with self._lock:
+                if (job_id, idx) in self._active:
+                    continue
+                self._active.add((job_id, idx))
+            self.store.set_status(job_id, idx, PENDING)
+            self._pool.submit(self._run_school, job_id, idx, school, test_pref)
+            queued += 1
+        return queued
+
+    def _run_school(self, job_id, idx, school, test_pref):
+        self.store.set_status(job_id, idx, RUNNING)
+        try:
+            _, data = self.engine.scrape_school(school, test_pref)
+            if data:
+                self.store.set_status(job_id, idx, DONE, data=data)
+            else:
+                self.store.set_status(job_id, idx, SKIPPED)
+        except Exception as e:
+            self.store.set_status(job_id, idx, FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._active.discard((job_id, idx))
+
+    def status(self, job_id):
+        """Progress and partial results for a job, or None if it doesn't exist"""
+        if self.store.test_pref(job_id) is None:
+            return None
+        rows = self.store.schools(job_id)
+        counts = {state: 0 for state in (PENDING, RUNNING, DONE, SKIPPED, FAILED)}
+        for _, _, status, _, _ in rows:
+            counts[status] += 1
+        finished = counts[DONE] + counts[SKIPPED] + counts[FAILED]
+        return {
+            "job_id": job_id,
+            "status": "done" if finished == len(rows) else "running",
+            "progress": {"total": len(rows), **counts},
+            "data": [data for _, _, status, data, _ in rows if status == DONE],
+            "skipped": [school for _, school, status, _, _ in rows if status == SKIPPED],
+            "failed": [{"school": school, "error": error} for _, school, status, _, error in rows if status == FAILED],
+        }
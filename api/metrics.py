@@ -0,0 +1,100 @@
+"""
+Process-wide scrape metrics, rendered in the Prometheus text format by /api/metrics.
+
+Extractor records every page it fetches (latency, bytes, status, cache source, retries)
+and how long parsing took; ScrapeEngine records the time per school. Counters and
+histograms are keyed by label values and only ever grow, as Prometheus expects.
+"""
+import threading
+
+# Upper bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(label, "") for label in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_text(zip(self.labels, key))} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._values = {}  # label values -> [count per bucket..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(label, "") for label in self.labels)
+        with self._lock:
+            values = self._values.setdefault(key, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    values[i] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, values in sorted(self._values.items()):
+                labels = list(zip(self.labels, key))
+                for bound, count in zip(self.buckets, values):
+                    lines.append(f"{self.name}_bucket{_label_text(labels, [('le', bound)])} {count}")
+                lines.append(f"{self.name}_bucket{_label_text(labels, [('le', '+Inf')])} {values[-1]}")
+                lines.append(f"{self.name}_sum{_label_text(labels)} {values[-2]:.6f}")
+                lines.append(f"{self.name}_count{_label_text(labels)} {values[-1]}")
+        return lines
+
+
+# === SCRAPE METRICS ===
+
+# source: "network" (downloaded), "revalidated" (304 from collegedata), "cache" (fresh in the
+# page cache) or "shared" (answered by another caller's in-flight fetch of the same URL)
+PAGE_FETCH_SECONDS = Histogram("ufit_page_fetch_seconds", "Time to get a page, by page and source",
+                               ("page", "source"))
+PAGE_PARSE_SECONDS = Histogram("ufit_page_parse_seconds", "Time to parse and index a page", ("page",))
+PAGE_FETCHES = Counter("ufit_page_fetches_total", "Pages fetched, by page, source and HTTP status",
+                       ("page", "source", "status"))
+PAGE_BYTES = Counter("ufit_page_bytes_total", "Page bytes fetched, by source", ("source",))
+HTTP_RETRIES = Counter("ufit_http_retries_total", "Requests retried after a 429/5xx or connection error", ("page",))
+PAGE_ERRORS = Counter("ufit_page_errors_total", "Page fetches that raised (timeouts, connection errors)", ("page",))
+# source: "live", "result_cache" or "snapshot"
+SCHOOL_SECONDS = Histogram("ufit_school_scrape_seconds", "Time to produce one school's row", ("source", "found"))
+
+REGISTRY = [PAGE_FETCH_SECONDS, PAGE_PARSE_SECONDS, PAGE_FETCHES, PAGE_BYTES, HTTP_RETRIES, PAGE_ERRORS,
+            SCHOOL_SECONDS]
+
+
+def render(extra=()):
+    """Every metric in the Prometheus text format; extra is a list of (name, help, value) gauges"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    for name, help, value in extra:
+        lines.extend([f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"])
+    return "\n".join(lines) + "\n"
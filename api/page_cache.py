@@ -0,0 +1,238 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+
+DAY = 24 * 60 * 60
+
+# How long a cached page is served without revalidating, by page name
+PAGE_TTLS = {
+    "base": 30 * DAY,
+    "admission": 30 * DAY,
+    "money-matters": 90 * DAY,
+    "students": 90 * DAY,
+    "campus-life": 180 * DAY,
+}
+DEFAULT_TTL = 30 * DAY
+
+# How long a resolved school name -> URL slug is trusted, and how long a miss is remembered
+SLUG_TTL = 180 * DAY
+NEGATIVE_SLUG_TTL = 1 * DAY
+
+CACHE_PATH = os.environ.get("UFIT_CACHE_PATH", os.path.join(tempfile.gettempdir(), "ufit_page_cache.sqlite3"))
+
+# Status returned for a miss in offline mode (same as an HTTP "only-if-cached" miss)
+OFFLINE_MISS_STATUS = 504
+
+
+class CachedPage:
+    """Minimal response object handed back to the Extractor"""
+
+    def __init__(self, status_code, text, from_cache):
+        self.status_code = status_code
+        self.text = text
+        self.from_cache = from_cache
+
+
+class PageCache:
+    """SQLite-backed store of fetched pages keyed by URL, plus resolved school name slugs"""
+
+    def __init__(self, path=CACHE_PATH, ttls=PAGE_TTLS, offline=False):
+        self.path = path
+        self.ttls = ttls
+        self.offline = offline
+        self._local = threading.local()
+        self._init_db()
+
+    def _conn(self):
+        # sqlite3 connections can't be shared across threads, so keep one per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self):
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    page TEXT,
+                    body BLOB,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL
+                )
+            """)
+            # slug is NULL for names that did not resolve to any page
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS slugs (
+                    name TEXT PRIMARY KEY,
+                    display_name TEXT,
+                    slug TEXT,
+                    resolved_at REAL
+                )
+            """)
+
+    def ttl(self, page):
+        return self.ttls.get(page, DEFAULT_TTL)
+
+    def lookup(self, url):
+        """Returns (text, etag, last_modified, fetched_at) or None"""
+        row = self._conn().execute(
+            "SELECT body, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return zlib.decompress(body).decode("utf-8"), etag, last_modified, fetched_at
+
+    def is_fresh(self, url, page):
+        """True if url is cached and within its page TTL, so fetching it needs no request"""
+        row = self._conn().execute("SELECT fetched_at FROM pages WHERE url = ?", (url,)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl(page)
+
+    def store(self, url, page, text, etag=None, last_modified=None):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (url, page, zlib.compress(text.encode("utf-8")), etag, last_modified, time.time()),
+            )
+
+    def touch(self, url):
+        """Mark a cached page as fresh again after a 304"""
+        with self._conn() as conn:
+            conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def fetch(self, url, page, network_get):
+        """
+        Serve url from the cache when fresh, otherwise revalidate or refetch it.
+        network_get(extra_headers) performs the actual request and returns a requests.Response.
+        """
+        served, cached, conditional = self._serve_cached(url, page)
+        if served:
+            return served
+        return self._handle_response(url, page, cached, network_get(conditional))
+
+    async def fetch_async(self, url, page, network_get):
+        """fetch() for an async network_get, e.g. one built on httpx.AsyncClient"""
+        # SQLite blocks, so reads and writes go to a thread and the loop keeps serving other fetches
+        served, cached, conditional = await asyncio.to_thread(self._serve_cached, url, page)
+        if served:
+            return served
+        r = await network_get(conditional)
+        return await asyncio.to_thread(self._handle_response, url, page, cached, r)
+
+    def _serve_cached(self, url, page):
+        """Returns (CachedPage to serve without a request or None, cached row, conditional request headers)"""
+        cached = self.lookup(url)
+        if cached:
+            text, etag, last_modified, fetched_at = cached
+            if self.offline or time.time() - fetched_at < self.ttl(page):
+                return CachedPage(200, text, from_cache=True), cached, {}
+        elif self.offline:
+            return CachedPage(OFFLINE_MISS_STATUS, "", from_cache=True), cached, {}
+
+        conditional = {}
+        if cached and cached[1]:
+            conditional["If-None-Match"] = cached[1]
+        if cached and cached[2]:
+            conditional["If-Modified-Since"] = cached[2]
+        return None, cached, conditional
+
+    def _handle_response(self, url, page, cached, r):
+        if r.status_code == 304 and cached:
+            self.touch(url)
+            return CachedPage(200, cached[0], from_cache=True)
+        if r.status_code == 200:
+            self.store(url, page, r.text, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        return CachedPage(r.status_code, r.text, from_cache=False)
+
+    def lookup_slug(self, name):
+        """
+        Returns (display_name, slug) for a resolved name, (None, None) for a remembered miss,
+        or None if the name has not been resolved recently.
+        """
+        row = self._conn().execute(
+            "SELECT display_name, slug, resolved_at FROM slugs WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        display_name, slug, resolved_at = row
+        ttl = SLUG_TTL if slug is not None else NEGATIVE_SLUG_TTL
+        if time.time() - resolved_at >= ttl:
+            return None
+        return display_name, slug
+
+    def store_slug(self, name, display_name, slug):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO slugs VALUES (?, ?, ?, ?)",
+                (name, display_name, slug, time.time()),
+            )
+
+    def stats(self):
+        """Summary of what is cached, for the CLI"""
+        now = time.time()
+        by_page = {}
+        for page, fetched_at in self._conn().execute("SELECT page, fetched_at FROM pages"):
+            counts = by_page.setdefault(page, {"pages": 0, "stale": 0})
+            counts["pages"] += 1
+            if now - fetched_at >= self.ttl(page):
+                counts["stale"] += 1
+        resolved, misses = self._conn().execute(
+            "SELECT COUNT(slug), COUNT(*) - COUNT(slug) FROM slugs"
+        ).fetchone()
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return {"path": self.path, "bytes": size, "by_page": by_page,
+                "slugs": {"resolved": resolved, "misses": misses}}
+
+    def purge(self, expired_only=False):
+        """Delete cached pages; returns how many were removed"""
+        with self._conn() as conn:
+            if not expired_only:
+                conn.execute("DELETE FROM slugs")
+                return conn.execute("DELETE FROM pages").rowcount
+            now = time.time()
+            conn.execute(
+                "DELETE FROM slugs WHERE resolved_at < ? OR (slug IS NULL AND resolved_at < ?)",
+                (now - SLUG_TTL, now - NEGATIVE_SLUG_TTL),
+            )
+            stale = [url for url, page, fetched_at in conn.execute("SELECT url, page, fetched_at FROM pages")
+                     if now - fetched_at >= self.ttl(page)]
+            conn.executemany("DELETE FROM pages WHERE url = ?", [(url,) for url in stale])
+            return len(stale)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure(path=CACHE_PATH, ttls=PAGE_TTLS, offline=False):
+    """Replace the process-wide cache, e.g. to switch to offline mode"""
+    global _cache
+    with _cache_lock:
+        _cache = PageCache(path, ttls, offline)
+    return _cache
+
+
+def get_cache():
+    """Return the process-wide cache, creating it on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PageCache()
+    return _cache
+
+
+def fetch(url, page, network_get):
+    return get_cache().fetch(url, page, network_get)
+
+
+async def fetch_async(url, page, network_get):
+    return await get_cache().fetch_async(url, page, network_get)
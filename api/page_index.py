@@ -0,0 +1,130 @@
+import os
+
+
+def available_parsers():
+    """Parser backends usable here, fastest first"""
+    parsers = []
+    try:
+        import lxml  # noqa: F401  (C-backed, several times faster than html.parser)
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    parsers.append("html.parser")
+    return parsers
+
+
+# None picks the fastest available backend
+PARSER = os.environ.get("UFIT_HTML_PARSER")
+
+# The index only reads divs and tables, so skipping everything else (head, scripts,
+# the inline JSON React ships) saves parse time. Off by default: a label outside
+# any div or table would be missed.
+CONTENT_ONLY = os.environ.get("UFIT_PARSE_CONTENT_ONLY") == "1"
+CONTENT_TAGS = ["div", "table"]
+
+
+def parse(html, parser=None, content_only=None):
+    """Parse a page with the configured backend"""
+    # Imported here so routes that never scrape don't load bs4 and lxml on a cold start
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    content_only = CONTENT_ONLY if content_only is None else content_only
+    return BeautifulSoup(html, parser or PARSER or available_parsers()[0],
+                         parse_only=SoupStrainer(CONTENT_TAGS) if content_only else None)
+
+
+class PageIndex:
+    """
+    Label lookups for a parsed page, built from a single walk over the tree.
+
+    Covers the layouts collegedata uses:
+    <div class="TitleValue_title...">Label</div><div class="TitleValue_value...">Value</div>
+    <div class="StatLine_label...">Label</div><div class="StatLine_value...">Value</div>
+    <td>Label</td><td>Value</td>
+    and label divs followed by several sibling divs (SAT/ACT ranges, merit aid).
+    Lookups are field_specs.Lookup values, with their labels already lowercased.
+    """
+
+    def __init__(self, soup):
+        from bs4 import NavigableString, Tag
+
+        self._divs = []         # (lowercased text, div) for divs holding a single string, in page order
+        self._exact = {}        # lowercased text -> first div with exactly that text
+        self._cells = []        # (lowercased text, td/th) in page order
+        self._strings = []      # every text node, for phrase searches
+        self._found = {}        # memoized find() results
+
+        for node in soup.descendants:
+            if isinstance(node, Tag):
+                if node.name not in ("div", "td", "th") or node.string is None:
+                    continue
+                text = str(node.string).lower()
+                if node.name == "div":
+                    self._divs.append((text, node))
+                    self._exact.setdefault(text, node)
+                else:
+                    self._cells.append((text, node))
+            elif isinstance(node, NavigableString):
+                self._strings.append(node)
+
+    def find(self, lookup):
+        """Text for a Lookup on this page, resolved once per page however many columns use it"""
+        if lookup not in self._found:
+            self._found[lookup] = getattr(self, f"_find_{lookup.layout}")(lookup)
+        return self._found[lookup]
+
+    def _label(self, lookup):
+        """First label div for the lookup, or None"""
+        div = self._exact.get(lookup.label) if lookup.match != "contains" else None
+        if div is None and lookup.match != "exact":
+            div = next((div for text, div in self._divs if lookup.label in text), None)
+        return div
+
+    def _find_value(self, lookup):
+        """Text of the div (or table cell) right after the label, or "N/A" """
+        label_div = self._label(lookup)
+        if label_div:
+            value_div = label_div.find_next_sibling('div')
+            if value_div:
+                return value_div.get_text(strip=True)
+
+        # Fallback for table-based layouts
+        target = next((cell for text, cell in self._cells if lookup.label in text), None)
+        if target:
+            sibling = target.find_next_sibling('td')
+            if sibling:
+                return sibling.get_text(strip=True)
+
+        return "N/A"
+
+    def _find_next(self, lookup):
+        """Text of the div right after the label, or "N/A" """
+        label_div = self._label(lookup)
+        value_div = label_div.find_next_sibling('div') if label_div else None
+        return value_div.get_text(strip=True) if value_div else "N/A"
+
+    def _find_siblings(self, lookup):
+        """Text of the first div after the label whose text contains every needle, or None"""
+        label_div = self._label(lookup)
+        if not label_div:
+            return None
+        for current in label_div.find_next_siblings('div'):
+            text = current.get_text(strip=True)
+            text_lower = text.lower()
+            if all(needle in text_lower for needle in lookup.needles):
+                return text
+        return None
+
+    def _find_stat_line(self, lookup):
+        """Value of a StatLine_label/StatLine_value pair, or None if the page doesn't use that layout"""
+        for text, div in self._divs:
+            if lookup.label in text and any('StatLine_label' in cls for cls in div.get('class', [])):
+                for value_div in div.find_next_siblings('div'):
+                    if any('StatLine_value' in cls for cls in value_div.get('class', [])):
+                        return value_div.get_text(strip=True)
+                return "N/A"
+        return None
+
+    def _find_phrase(self, lookup):
+        """First text node containing the phrase, or None"""
+        return next((text for text in self._strings if lookup.label in text.lower()), None)
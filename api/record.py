@@ -0,0 +1,247 @@
+"""
+SchoolRecord: one school's scraped row with numbers kept as numbers.
+
+Ranges, rates, costs, merit aid and deadlines are parsed once when the row is extracted
+and stored in slots as ints/floats, so rows can be sorted and filtered without
+re-parsing strings. Display strings ("1450-1560", "12.5% (10.3% OOS)") are only
+produced at the output edges by to_row(); for reading, a record also behaves like the
+old row dict (record["SAT Range"], .get, .items, "column" in record).
+
+Text that doesn't survive parse -> format unchanged (an unusual deadline, a cost with a
+note) is kept as is for display, so output never changes; its numbers are still parsed
+where possible.
+"""
+import calendar
+import re
+
+NA = "N/A"
+
+MONTHS = {name.lower(): i for i, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): i for i, name in enumerate(calendar.month_abbr) if name})
+
+
+# === PARSERS AND FORMATTERS ===
+# Each column maps to slots, a parser from display text to slot values (None if the text
+# isn't in the expected shape) and a formatter back. "N/A" parses to all-None slots.
+
+def _parse_text(text):
+    return (text,)
+
+def _format_text(text):
+    return text
+
+def _parse_count(text):
+    if not re.fullmatch(r"\d{1,3}(,\d{3})*|\d+", text):
+        return None
+    return (int(text.replace(",", "")),)
+
+def _format_count(count):
+    return f"{count:,}"
+
+def _parse_number(text):
+    if not re.fullmatch(r"\d+(\.\d+)?", text):
+        return None
+    return (float(text),)
+
+def _format_number(number):
+    return f"{number:g}"
+
+def _parse_range(text):
+    match = re.fullmatch(r"(\d+)-(\d+)", text)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+def _format_range(low, high):
+    return f"{low}-{high}"
+
+def _parse_rate(text):
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)%(?: \((\d+(?:\.\d+)?)% OOS\))?", text)
+    if not match:
+        return None
+    return float(match.group(1)), float(match.group(2)) if match.group(2) else None
+
+def _format_rate(rate, oos_rate):
+    return f"{rate:g}%" + (f" ({oos_rate:g}% OOS)" if oos_rate is not None else "")
+
+def _parse_dollars(text):
+    match = re.fullmatch(r"\$(\d{1,3}(?:,\d{3})*|\d+)", text)
+    return (int(match.group(1).replace(",", "")),) if match else None
+
+def _format_dollars(amount):
+    return f"${amount:,}"
+
+def _parse_merit(text):
+    pct = re.search(r"(\d+(?:\.\d+)?)%", text)
+    amount = re.search(r"\$(\d{1,3}(?:,\d{3})*|\d+)", text)
+    if not pct and not amount:
+        return None
+    return (float(pct.group(1)) if pct else None,
+            int(amount.group(1).replace(",", "")) if amount else None)
+
+def _format_merit(pct, amount):
+    parts = [f"{pct:g}%"] if pct is not None else []
+    parts.append("received")
+    if amount is not None:
+        parts.append(f"${amount:,}")
+    return " ".join(parts)
+
+def _parse_deadlines(text):
+    """"ED: Nov 1, RD: Jan 5" -> ((("ED", 11, 1), ("RD", 1, 5)),); unreadable dates keep None"""
+    deadlines = []
+    for part in text.split(", "):
+        name, _, date = part.partition(": ")
+        if not date:
+            return None
+        match = re.fullmatch(r"([A-Za-z]+)\.? (\d{1,2})", date)
+        month = MONTHS.get(match.group(1).lower()) if match else None
+        deadlines.append((name, month, int(match.group(2)) if month else None))
+    return (tuple(deadlines),)
+
+def _format_deadlines(deadlines):
+    return ", ".join(f"{name}: {calendar.month_name[month]} {day}" if month else f"{name}: {NA}"
+                     for name, month, day in deadlines)
+
+
+# column -> (slots, parse, format)
+COLUMNS = {
+    "University": (("university",), _parse_text, _format_text),
+    "Location": (("location",), _parse_text, _format_text),
+    "Number of Undergraduates": (("undergrads",), _parse_count, _format_count),
+    "Test Policy": (("test_policy",), _parse_text, _format_text),
+    "Avg GPA": (("avg_gpa",), _parse_number, _format_number),
+    "SAT Range": (("sat_low", "sat_high"), _parse_range, _format_range),
+    "ACT Range": (("act_low", "act_high"), _parse_range, _format_range),
+    "Acceptance Rate": (("acceptance_rate", "oos_acceptance_rate"), _parse_rate, _format_rate),
+    "Cost of Attendance": (("cost",), _parse_dollars, _format_dollars),
+    "Merit Aid": (("merit_aid_pct", "merit_aid_amount"), _parse_merit, _format_merit),
+    "Likely/Target/Reach": (("likely_target_reach",), _parse_text, _format_text),
+    "ED/EA/Rolling": (("early_options",), _parse_text, _format_text),
+    "Application Deadlines": (("deadlines",), _parse_deadlines, _format_deadlines),
+}
+
+# Records share one tuple per distinct column list instead of each holding its own
+_column_tuples = {}
+
+
+def _intern_columns(columns):
+    columns = tuple(columns)
+    return _column_tuples.setdefault(columns, columns)
+
+
+class SchoolRecord:
+    __slots__ = tuple(slot for slots, _, _ in COLUMNS.values() for slot in slots) + ("columns", "_text")
+
+    def __init__(self, columns):
+        self.columns = _intern_columns(columns)
+        # column -> display text, only for text that formatting wouldn't reproduce exactly
+        self._text = None
+        for slot in self.__slots__[:-2]:
+            setattr(self, slot, None)
+
+    @classmethod
+    def from_row(cls, row):
+        """Parse a {column: display text} row (as built by the getters or read from a CSV)"""
+        record = cls(row.keys())
+        for column, text in row.items():
+            slots, parse, format = COLUMNS[column]
+            values = parse(text) if text != NA else None
+            if values is not None:
+                for slot, value in zip(slots, values):
+                    setattr(record, slot, value)
+            if values is None and text != NA or values is not None and format(*values) != text:
+                if record._text is None:
+                    record._text = {}
+                record._text[column] = text
+        return record
+
+    def format(self, column):
+        """Display text for one column"""
+        if self._text and column in self._text:
+            return self._text[column]
+        slots, _, format = COLUMNS[column]
+        values = [getattr(self, slot) for slot in slots]
+        if all(value is None for value in values):
+            return NA
+        return format(*values)
+
+    def to_row(self, order=None):
+        """{column: display text}, in order (columns not in order go last) or in scrape order"""
+        columns = self.columns
+        if order is not None:
+            columns = [column for column in order if column in self.columns] + \
+                      [column for column in self.columns if column not in order]
+        return {column: self.format(column) for column in columns}
+
+    def narrow(self, columns):
+        """A copy holding only those of columns this record has"""
+        record = SchoolRecord([column for column in self.columns if column in columns])
+        for column in record.columns:
+            for slot in COLUMNS[column][0]:
+                setattr(record, slot, getattr(self, slot))
+            if self._text and column in self._text:
+                if record._text is None:
+                    record._text = {}
+                record._text[column] = self._text[column]
+        return record
+
+    # === STORAGE ===
+
+    def to_json(self):
+        """JSON-ready dict of the typed values, for the snapshot, job store and result cache"""
+        values = {slot: getattr(self, slot) for column in self.columns for slot in COLUMNS[column][0]}
+        return {"columns": list(self.columns), "values": values, "text": self._text}
+
+    @classmethod
+    def from_json(cls, obj):
+        """Inverse of to_json; also accepts a plain row dict saved before records existed"""
+        if "values" not in obj:
+            return cls.from_row(obj)
+        record = cls(obj["columns"])
+        for slot, value in obj["values"].items():
+            if slot == "deadlines" and value is not None:
+                value = tuple(tuple(deadline) for deadline in value)
+            setattr(record, slot, value)
+        record._text = obj.get("text")
+        return record
+
+    # === NUMERIC HELPERS ===
+
+    @property
+    def sat_mid(self):
+        return (self.sat_low + self.sat_high) / 2 if self.sat_low is not None else None
+
+    @property
+    def act_mid(self):
+        return (self.act_low + self.act_high) / 2 if self.act_low is not None else None
+
+    # === ROW DICT COMPATIBILITY ===
+
+    def __getitem__(self, column):
+        if column not in self.columns:
+            raise KeyError(column)
+        return self.format(column)
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get(self, column, default=None):
+        return self.format(column) if column in self.columns else default
+
+    def keys(self):
+        return dict.fromkeys(self.columns).keys()
+
+    def items(self):
+        return self.to_row().items()
+
+    def __eq__(self, other):
+        if isinstance(other, SchoolRecord):
+            other = other.to_row()
+        return self.to_row() == other
+
+    def __repr__(self):
+        return f"SchoolRecord({self.to_row()!r})"
@@ -0,0 +1,101 @@
+"""
+Incremental refresh of a spreadsheet saved by main.py or /api/export.
+
+Only schools with a page that is missing from the page cache or past its TTL are
+scraped again. Stale pages are revalidated with If-None-Match / If-Modified-Since,
+so pages collegedata hasn't changed cost a 304 and no download. Every other school
+keeps its previous row without any request. The result is the refreshed rows plus
+a diff of the fields that changed.
+"""
+from data import Constants, PAGES, SEARCH_URL, get_columns, pages_for, resolve_known
+from record import COLUMNS, SchoolRecord
+from scraper import ScrapeEngine
+import page_cache
+import csv
+import os
+
+
+def load_rows(path):
+    """SchoolRecords from a CSV (or .tsv) written by to_csv or /api/export, in file order"""
+    delimiter = "\t" if path.lower().endswith(".tsv") else ","
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        columns = [column for column in reader.fieldnames or [] if column in COLUMNS]
+        if "University" not in columns:
+            raise ValueError(f"{path} has no University column")
+        return [SchoolRecord.from_row({column: row[column] or "" for column in columns}) for row in reader]
+
+
+def plan(rows):
+    """test_pref and fields that reproduce the columns of the previous file"""
+    columns = rows[0].columns
+    if "SAT Range" in columns and "ACT Range" not in columns:
+        test_pref = Constants.SAT
+    elif "ACT Range" in columns and "SAT Range" not in columns:
+        test_pref = Constants.ACT
+    else:
+        test_pref = Constants.BOTH
+    return test_pref, list(columns)
+
+
+def is_stale(school, pages, cache):
+    """True if any page the row needs would have to go to the network"""
+    resolved = resolve_known(school)
+    if resolved is None or resolved[1] is None:
+        return True
+    base_url = f"{SEARCH_URL}/{resolved[1]}"
+    return not all(cache.is_fresh(f"{base_url}{PAGES[page]}", page) for page in pages)
+
+
+def diff(old, new):
+    """{column: (old text, new text)} for the columns whose display text changed"""
+    old_row, new_row = old.to_row(), new.to_row()
+    return {column: (old_row[column], new_row.get(column, ""))
+            for column in old_row if old_row[column] != new_row.get(column, "")}
+
+
+def refresh(rows, engine=None):
+    """
+    Returns (rows, changes, stats): the refreshed rows in the same order (the previous row
+    where nothing was stale or the school can't be found anymore), {school: diff} for rows
+    that changed, and counts of what was done.
+    """
+    engine = engine or ScrapeEngine()
+    test_pref, fields = plan(rows)
+    pages = pages_for(get_columns(test_pref, fields))
+    cache = page_cache.get_cache()
+
+    stale = [i for i, row in enumerate(rows) if is_stale(row.university, pages, cache)]
+    scraped = engine.scrape([rows[i].university for i in stale], test_pref, fields)
+
+    refreshed = list(rows)
+    changes = {}
+    missing = []
+    requests = 0
+    for i, (extractor, record) in zip(stale, scraped):
+        requests += extractor.request_count if extractor else 0
+        if record is None:
+            missing.append(rows[i].university)
+            continue
+        if "Likely/Target/Reach" in record:
+            # Filled in by hand; keep it instead of the scraped placeholder
+            record.likely_target_reach = rows[i].likely_target_reach
+        changed = diff(rows[i], record)
+        if changed:
+            changes[rows[i].university] = changed
+        refreshed[i] = record
+
+    stats = {"schools": len(rows), "rechecked": len(stale), "changed": len(changes),
+             "requests": requests, "not_found": missing}
+    return refreshed, changes, stats
+
+
+def write_diff(changes, path):
+    """One line per changed field: school, column, old value, new value"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["School", "Column", "Old", "New"])
+        for school, changed in changes.items():
+            for column, (old, new) in changed.items():
+                writer.writerow([school, column, old, new])
+    return os.path.abspath(path)
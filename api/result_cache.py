@@ -0,0 +1,112 @@
+"""
+Cache of fully extracted rows, keyed by (resolved school, test_pref, fields).
+
+Rows (SchoolRecords) live in an in-process LRU with a TTL and a size bound. An optional backend (e.g.
+SQLiteBackend on a shared path) lets several workers reuse each other's rows; the LRU
+is checked first and refilled from the backend on a local miss.
+"""
+from data import normalize_school_name
+from record import SchoolRecord
+from school_index import normalize_key
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+MAX_ENTRIES = 1000
+TTL = 60 * 60
+BACKEND_PATH = os.environ.get("UFIT_RESULT_CACHE_PATH")
+
+
+def make_key(school, test_pref, fields=None):
+    """Same key for "ucla", "UCLA" and "uclosangeles" """
+    return (normalize_key(normalize_school_name(school)), test_pref, tuple(sorted(fields)) if fields else None)
+
+
+class SQLiteBackend:
+    """Result store shared by every process pointing at the same file"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, data TEXT, expires_at REAL)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT data, expires_at FROM results WHERE key = ?", (json.dumps(key),)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return SchoolRecord.from_json(json.loads(row[0]))
+
+    def set(self, key, data, ttl):
+        with self._conn() as conn:
+            conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                         (json.dumps(key), json.dumps(data.to_json()), time.time() + ttl))
+
+
+class ResultCache:
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> (data, expires_at), least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+
+        data = self.backend.get(key) if self.backend else None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.backend_hits += 1
+        self._remember(key, data)
+        return data
+
+    def set(self, key, data):
+        self._remember(key, data)
+        if self.backend:
+            self.backend.set(key, data, self.ttl)
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._entries[key] = (data, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+            }
+
+
+def default_cache():
+    """LRU, shared through SQLite when UFIT_RESULT_CACHE_PATH is set"""
+    return ResultCache(backend=SQLiteBackend(BACKEND_PATH) if BACKEND_PATH else None)
@@ -0,0 +1,217 @@
+"""
+Local directory of collegedata schools, used to resolve user input without network probes.
+
+The index lives in school_index.json as a list of [name, slug, aliases] rows. slug is only
+set for schools confirmed by a crawl; seed rows (aliases carried over from the old hand-written
+name map) leave it null so the Extractor still probes URL patterns for them.
+
+    python school_index.py --crawl         rebuild from the collegedata sitemap, keeping aliases
+    python school_index.py --emit-js       regenerate static/school_name_map.js
+    python school_index.py --search QUERY  try a lookup
+"""
+from collections import defaultdict, namedtuple
+import bisect
+import json
+import os
+import re
+
+INDEX_PATH = os.path.join(os.path.dirname(__file__), "school_index.json")
+JS_PATH = os.path.join(os.path.dirname(__file__), "static", "school_name_map.js")
+SITEMAP_URL = "https://waf.collegedata.com/sitemap.xml"
+
+# A fuzzy match only counts as the school the user meant if it looks like a typo:
+# nearly the same characters (difflib ratio) and about the same length
+RESOLVE_RATIO = 0.9
+RESOLVE_MAX_LENGTH_DIFF = 3
+
+School = namedtuple("School", ["name", "slug", "aliases"])
+
+
+def normalize_key(text):
+    """Lowercase and drop everything but letters and digits: "U of I" -> "uofi" """
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SchoolIndex:
+    """Exact, prefix and trigram lookups over school names and aliases"""
+
+    def __init__(self, schools):
+        self.schools = schools
+        self._by_key = {}
+        for school in schools:
+            for text in [school.name, *school.aliases]:
+                self._by_key.setdefault(normalize_key(text), school)
+        self._sorted_keys = sorted(self._by_key)
+        # Only fuzzy matching needs trigrams; exact lookups (the common case) never build them
+        self._trigrams = None
+
+    def _trigram_index(self):
+        """(trigram -> keys, key -> trigram count), built on first use"""
+        if self._trigrams is None:
+            by_trigram = defaultdict(set)
+            gram_counts = {}
+            for key in self._by_key:
+                grams = trigrams(key)
+                gram_counts[key] = len(grams)
+                for gram in grams:
+                    by_trigram[gram].add(key)
+            self._trigrams = by_trigram, gram_counts
+        return self._trigrams
+
+    def lookup(self, query):
+        """Exact match on a normalized name or alias"""
+        return self._by_key.get(normalize_key(query))
+
+    def prefix(self, query, limit=10):
+        key = normalize_key(query)
+        start = bisect.bisect_left(self._sorted_keys, key)
+        matches = []
+        for candidate in self._sorted_keys[start:]:
+            if not candidate.startswith(key) or len(matches) >= limit:
+                break
+            school = self._by_key[candidate]
+            if school not in matches:
+                matches.append(school)
+        return matches
+
+    def fuzzy(self, query, limit=10):
+        """Returns [(score, school)] ranked by trigram (Jaccard) similarity"""
+        scored = {}
+        for score, key in self._fuzzy_keys(normalize_key(query)):
+            school = self._by_key[key]
+            scored[school] = max(score, scored.get(school, 0))
+        return sorted(((score, school) for school, score in scored.items()),
+                      key=lambda pair: -pair[0])[:limit]
+
+    def _fuzzy_keys(self, key):
+        by_trigram, gram_counts = self._trigram_index()
+        grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in grams:
+            for candidate in by_trigram.get(gram, ()):
+                shared[candidate] += 1
+        return [(count / (len(grams) + gram_counts[candidate] - count), candidate)
+                for candidate, count in shared.items()]
+
+    def resolve(self, query):
+        """The school a user most likely meant, or None if nothing is close enough"""
+        school = self.lookup(query)
+        if school:
+            return school
+        from difflib import SequenceMatcher
+
+        key = normalize_key(query)
+        # Trigrams shortlist the candidates; a character-level ratio decides
+        shortlist = sorted(self._fuzzy_keys(key), reverse=True)[:5]
+        best_ratio, best_key = 0, None
+        for _, candidate in shortlist:
+            if abs(len(candidate) - len(key)) > RESOLVE_MAX_LENGTH_DIFF:
+                continue
+            ratio = SequenceMatcher(None, key, candidate).ratio()
+            if ratio > best_ratio:
+                best_ratio, best_key = ratio, candidate
+        if best_ratio >= RESOLVE_RATIO:
+            return self._by_key[best_key]
+        return None
+
+    def search(self, query, limit=10):
+        """Suggestions for autocomplete: exact, then prefix, then fuzzy matches"""
+        results = []
+        exact = self.lookup(query)
+        candidates = ([exact] if exact else []) + self.prefix(query, limit) + \
+            [school for _, school in self.fuzzy(query, limit)]
+        for school in candidates:
+            if school not in results:
+                results.append(school)
+        return results[:limit]
+
+    def alias_map(self):
+        """alias key -> school name, the shape the frontend autocomplete expects"""
+        return {normalize_key(alias): school.name for school in self.schools for alias in school.aliases}
+
+
+def load_index(path=INDEX_PATH):
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)["schools"]
+    return SchoolIndex([School(name, slug, tuple(aliases)) for name, slug, aliases in rows])
+
+
+def save_index(schools, path=INDEX_PATH):
+    rows = [[school.name, school.slug, sorted(school.aliases)]
+            for school in sorted(schools, key=lambda school: school.name)]
+    # One school per line keeps diffs of a rebuilt index readable
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"version":1,"schools":[\n')
+        f.write(",\n".join(json.dumps(row, separators=(",", ":")) for row in rows))
+        f.write("\n]}\n")
+
+
+_index = None
+
+
+def get_index():
+    """Process-wide index, loaded on first use"""
+    global _index
+    if _index is None:
+        _index = load_index()
+    return _index
+
+
+def crawl(sitemap_url=SITEMAP_URL):
+    """Returns {slug: name} for every school page listed in the collegedata sitemap"""
+    import http_client
+    r = http_client.get(sitemap_url, headers={"User-Agent": "Mozilla/5.0"})
+    r.raise_for_status()
+    slugs = set(re.findall(r"<loc>[^<]*/college-search/([a-z0-9-]+)/?</loc>", r.text))
+    return {slug: slug.replace("-", " ").title() for slug in slugs}
+
+
+def merge(crawled, existing):
+    """Combine crawled slugs with the aliases already in the index"""
+    by_key = {normalize_key(name): (name, slug, []) for slug, name in crawled.items()}
+    for school in existing.schools:
+        key = normalize_key(school.name)
+        if key in by_key:
+            by_key[key][2].extend(school.aliases)
+        else:
+            # Not in the sitemap; keep it so its aliases still resolve
+            by_key[key] = (school.name, school.slug, list(school.aliases))
+    return [School(name, slug, tuple(aliases)) for name, slug, aliases in by_key.values()]
+
+
+def emit_js(index, path=JS_PATH):
+    entries = ",\n".join(f"    {json.dumps(alias)}: {json.dumps(name)}"
+                         for alias, name in index.alias_map().items())
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("// Generated by api/school_index.py --emit-js from school_index.json. Do not edit by hand.\n")
+        f.write(f"const SCHOOL_NAME_MAP = {{\n{entries}\n}}\n")
+        f.write("export default SCHOOL_NAME_MAP\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build and query the local school index")
+    parser.add_argument("--crawl", nargs="?", const=SITEMAP_URL, metavar="SITEMAP_URL",
+                        help="rebuild the index from the collegedata sitemap")
+    parser.add_argument("--emit-js", action="store_true", help="regenerate the frontend name map")
+    parser.add_argument("--search", metavar="QUERY", help="print the best matches for a query")
+    args = parser.parse_args()
+
+    index = get_index()
+    if args.crawl:
+        schools = merge(crawl(args.crawl), index)
+        save_index(schools)
+        index = SchoolIndex(schools)
+        print(f"✓ Indexed {len(schools)} schools")
+    if args.emit_js:
+        emit_js(index)
+        print(f"✓ Wrote {JS_PATH}")
+    if args.search:
+        for school in index.search(args.search):
+            print(f"  {school.name} ({school.slug or 'slug unknown'})")
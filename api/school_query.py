@@ -0,0 +1,111 @@
+"""
+Filter and sort the schools in the crawler snapshot by their numbers, without scraping.
+
+SchoolTable keeps the records column-wise (one list of values per numeric field, by row)
+and presorts every field once, so each condition is a bisect into a sorted column and
+ordering by a field is a lookup of precomputed ranks:
+
+    table = snapshot.table()
+    table.query(parse_where("acceptance_rate > 30 and sat_mid < 1400"), sort="cost", limit=20)
+
+Rates and percentages are in percent (30 means 30%), costs and merit aid in dollars. A
+school without a value for a field never matches a condition on it and sorts last.
+"""
+from bisect import bisect_left, bisect_right
+import re
+
+# SchoolRecord attributes that can be filtered and sorted on
+NUMERIC_FIELDS = (
+    "sat_low", "sat_high", "sat_mid",
+    "act_low", "act_high", "act_mid",
+    "acceptance_rate", "oos_acceptance_rate",
+    "cost", "merit_aid_pct", "merit_aid_amount",
+    "avg_gpa", "undergrads",
+)
+OPERATORS = ("<", "<=", ">", ">=", "==")
+
+CONDITION = re.compile(r"\s*([a-z_]+)\s*(<=|>=|==|=|<|>)\s*\$?(\d[\d,]*(?:\.\d+)?|\.\d+)%?\s*")
+
+
+def _check_field(field):
+    if field not in NUMERIC_FIELDS:
+        raise ValueError(f"Unknown field: {field}. Choose from: {', '.join(NUMERIC_FIELDS)}")
+
+
+def parse_where(text):
+    """"acceptance_rate > 30 and sat_mid < 1400" -> [("acceptance_rate", ">", 30.0), ("sat_mid", "<", 1400.0)]"""
+    conditions = []
+    if not text or not text.strip():
+        return conditions
+    for part in re.split(r"\s+and\s+", text.strip(), flags=re.IGNORECASE):
+        match = CONDITION.fullmatch(part)
+        if not match:
+            raise ValueError(f"Can't read condition {part.strip()!r}; write it like \"sat_mid < 1400\"")
+        field, op, value = match.groups()
+        _check_field(field)
+        conditions.append((field, "==" if op == "=" else op, float(value.replace(",", ""))))
+    return conditions
+
+
+def parse_sort(text):
+    """"cost" -> ("cost", False), "-cost" -> ("cost", True) for descending, None -> (None, False)"""
+    if not text or not text.strip():
+        return None, False
+    text = text.strip()
+    field = text.lstrip("-")
+    _check_field(field)
+    return field, text.startswith("-")
+
+
+class SchoolTable:
+    def __init__(self, records):
+        self.records = list(records)
+        # field -> value for each row (None where the school has no number)
+        self.columns = {field: [getattr(record, field) for record in self.records] for field in NUMERIC_FIELDS}
+        # field -> (values ascending, their rows), rows without a value left out
+        self._sorted = {}
+        # field -> each row's position in that order (len(records) for rows without a value)
+        self._ranks = {}
+        for field, values in self.columns.items():
+            rows = sorted((row for row, value in enumerate(values) if value is not None), key=values.__getitem__)
+            self._sorted[field] = ([values[row] for row in rows], rows)
+            ranks = [len(self.records)] * len(self.records)
+            for rank, row in enumerate(rows):
+                ranks[row] = rank
+            self._ranks[field] = ranks
+
+    def __len__(self):
+        return len(self.records)
+
+    def _matching(self, field, op, value):
+        """Rows where field op value holds, as a slice of the sorted column"""
+        values, rows = self._sorted[field]
+        if op == "<":
+            return rows[:bisect_left(values, value)]
+        if op == "<=":
+            return rows[:bisect_right(values, value)]
+        if op == ">":
+            return rows[bisect_right(values, value):]
+        if op == ">=":
+            return rows[bisect_left(values, value):]
+        if op == "==":
+            return rows[bisect_left(values, value):bisect_right(values, value)]
+        raise ValueError(f"Unknown operator: {op}. Choose from: {', '.join(OPERATORS)}")
+
+    def query(self, conditions=(), sort=None, descending=False, limit=None):
+        """
+        Records matching every (field, op, value) condition, ordered by sort (table order
+        if None), at most limit of them.
+        """
+        matches = None
+        # Narrowest condition first, so the intersections stay small
+        for rows in sorted((self._matching(*condition) for condition in conditions), key=len):
+            matches = set(rows) if matches is None else matches.intersection(rows)
+        rows = range(len(self.records)) if matches is None else sorted(matches)
+
+        if sort is not None:
+            ranks = self._ranks[sort]
+            missing = len(self.records)
+            # Rows without a value stay last either way
+            rows = sorted(rows, key=lambda row: (ranks[row] == missing, -ranks[row] if descending else ranks[row]))
+        return [self.records[row] for row in rows[:limit]]
@@ -0,0 +1,239 @@
+from data import Extractor, get_columns, pages_for
+from async_data import AsyncExtractor
+from result_cache import make_key
+from singleflight import SingleFlight
+import http_client
+import metrics
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlparse
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+
+# Default concurrency limits
+MAX_SCHOOLS = 8        # schools scraped at the same time
+MAX_PAGE_WORKERS = 16  # threads fetching subpages across all schools
+GLOBAL_LIMIT = 16      # requests in flight across all hosts
+PER_HOST_LIMIT = 8     # requests in flight to a single host
+# Processes parsing pages; 0 parses on the fetching threads instead
+PARSE_WORKERS = int(os.environ.get("UFIT_PARSE_WORKERS", "0"))
+
+
+class RequestLimiter:
+    """Caps in-flight requests globally and per host"""
+
+    def __init__(self, global_limit=GLOBAL_LIMIT, per_host_limit=PER_HOST_LIMIT):
+        self.per_host_limit = per_host_limit
+        self._global = threading.BoundedSemaphore(global_limit)
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host_semaphore(self, host):
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._hosts[host]
+
+    @contextmanager
+    def __call__(self, url):
+        host_sem = self._host_semaphore(urlparse(url).netloc)
+        # Always take the global slot first so waiters can't deadlock each other
+        with self._global:
+            with host_sem:
+                yield
+
+
+class AsyncRequestLimiter:
+    """
+    A RequestLimiter's slots taken from coroutines. The semaphores are the threading ones,
+    so sync scrapes and async scrapes on any event loop (Flask runs each async request on
+    its own) all count against the same caps.
+    """
+
+    def __init__(self, limiter):
+        self._limiter = limiter
+
+    @asynccontextmanager
+    async def __call__(self, url):
+        host_sem = self._limiter._host_semaphore(urlparse(url).netloc)
+        # Same order as RequestLimiter: global slot first
+        await _acquire(self._limiter._global)
+        try:
+            await _acquire(host_sem)
+            try:
+                yield
+            finally:
+                host_sem.release()
+        finally:
+            self._limiter._global.release()
+
+
+async def _acquire(semaphore):
+    """Acquire a threading semaphore, waiting on a worker thread instead of the event loop"""
+    if semaphore.acquire(blocking=False):
+        return
+    acquired = asyncio.get_running_loop().run_in_executor(None, semaphore.acquire)
+    try:
+        await asyncio.shield(acquired)
+    except asyncio.CancelledError:
+        # The thread still gets the slot; hand it back as soon as it does
+        acquired.add_done_callback(lambda _: semaphore.release())
+        raise
+
+
+class ScrapeEngine:
+    """Scrapes many schools concurrently, fetching each school's subpages in parallel"""
+
+    def __init__(self, max_schools=MAX_SCHOOLS, page_workers=MAX_PAGE_WORKERS,
+                 global_limit=GLOBAL_LIMIT, per_host_limit=PER_HOST_LIMIT, snapshot=None, result_cache=None,
+                 parse_workers=PARSE_WORKERS):
+        self.max_schools = max_schools
+        # Optional result_cache.ResultCache and snapshot.Snapshot, consulted in that order before scraping live
+        self.result_cache = result_cache
+        self.snapshot = snapshot
+        self.global_limit = global_limit
+        self.per_host_limit = per_host_limit
+        self.limiter = RequestLimiter(global_limit, per_host_limit)
+        self.async_limiter = AsyncRequestLimiter(self.limiter)
+        # Shared across schools; school tasks wait on page tasks, so the pools must be separate
+        self._page_pool = ThreadPoolExecutor(max_workers=page_workers)
+        # With parse_workers, threads only download and a process pool parses, so parsing
+        # isn't serialized on the GIL; started on first use
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        self._parse_pool_lock = threading.Lock()
+        # Concurrent requests for the same school (e.g. overlapping lists from several users) share one scrape
+        self.school_flights = SingleFlight()
+
+    def scrape_school(self, school, test_pref, fields=None):
+        """
+        Returns (extractor, data); data is None if the school was not found.
+        extractor is None when the row came from the result cache or the snapshot, and is
+        shared with other callers when the school was already being scraped.
+        """
+        key = make_key(school.strip(), test_pref, fields)
+        data = self._lookup(school.strip(), key, test_pref, fields)
+        if data:
+            return None, data
+        return self.school_flights.do(key, lambda: self._scrape_live(school.strip(), key, test_pref, fields))
+
+    def _lookup(self, school, key, test_pref, fields):
+        """The school's row from the result cache or the snapshot, or None"""
+        start = time.perf_counter()
+        if self.result_cache:
+            data = self.result_cache.get(key)
+            if data:
+                metrics.SCHOOL_SECONDS.observe(time.perf_counter() - start, source="result_cache", found="true")
+                return data
+        if self.snapshot:
+            data = self.snapshot.lookup(school, test_pref, fields)
+            if data:
+                metrics.SCHOOL_SECONDS.observe(time.perf_counter() - start, source="snapshot", found="true")
+                return data
+        return None
+
+    def _scrape_live(self, school, key, test_pref, fields):
+        start = time.perf_counter()
+        extractor = Extractor(school, limiter=self.limiter)
+        data = None
+        if self.parse_workers:
+            data = extractor.get_full_data_pooled(test_pref, fields, self._page_pool, self.parse_pool())
+        elif extractor.prefetch(self._page_pool, pages_for(get_columns(test_pref, fields))):
+            data = extractor.get_full_data(test_pref, fields)
+        return self._finish_live(extractor, key, data, start)
+
+    def parse_pool(self):
+        if self._parse_pool is None:
+            with self._parse_pool_lock:
+                if self._parse_pool is None:
+                    # spawn, not fork: forking a process with live fetch threads can copy held locks
+                    self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                           mp_context=multiprocessing.get_context("spawn"))
+        return self._parse_pool
+
+    def _finish_live(self, extractor, key, data, start):
+        extractor.scrape_seconds = time.perf_counter() - start
+        metrics.SCHOOL_SECONDS.observe(extractor.scrape_seconds, source="live", found="true" if data else "false")
+        if self.result_cache and data:
+            self.result_cache.set(key, data)
+        return extractor, data
+
+    def _group_duplicates(self, schools, test_pref, fields):
+        """Input positions grouped by school, so "ucla, UCLA, uclosangeles" is scraped once"""
+        groups = {}
+        for i, school in enumerate(schools):
+            groups.setdefault(make_key(school.strip(), test_pref, fields), []).append(i)
+        return list(groups.values())
+
+    def scrape(self, schools, test_pref, fields=None):
+        """Returns a list of (extractor, data) in the same order as schools"""
+        if not schools:
+            return []
+        groups = self._group_duplicates(schools, test_pref, fields)
+        results = [None] * len(schools)
+        with ThreadPoolExecutor(max_workers=min(self.max_schools, len(groups))) as pool:
+            scraped = pool.map(lambda group: self.scrape_school(schools[group[0]], test_pref, fields), groups)
+            for group, result in zip(groups, scraped):
+                for i in group:
+                    results[i] = result
+        return results
+
+    def scrape_iter(self, schools, test_pref, fields=None):
+        """Yields (index, extractor, data) for each school as soon as it finishes, in completion order"""
+        if not schools:
+            return
+        groups = self._group_duplicates(schools, test_pref, fields)
+        pool = ThreadPoolExecutor(max_workers=min(self.max_schools, len(groups)))
+        try:
+            futures = {pool.submit(self.scrape_school, schools[group[0]], test_pref, fields): group
+                       for group in groups}
+            for future in as_completed(futures):
+                extractor, data = future.result()
+                for i in futures[future]:
+                    yield i, extractor, data
+        finally:
+            # If the consumer stops early (e.g. the client disconnected), drop queued schools
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # === ASYNC ===
+
+    async def scrape_async(self, schools, test_pref, fields=None):
+        """
+        Same as scrape(), but runs on the caller's event loop: every school's URL probes and
+        subpages are fetched concurrently with httpx instead of on worker threads.
+        """
+        if not schools:
+            return []
+        groups = self._group_duplicates(schools, test_pref, fields)
+        limiter = self.async_limiter
+        async with http_client.async_client() as client:
+            scraped = await asyncio.gather(*(
+                self._scrape_school_async(schools[group[0]].strip(), test_pref, fields, client, limiter)
+                for group in groups
+            ))
+        results = [None] * len(schools)
+        for group, result in zip(groups, scraped):
+            for i in group:
+                results[i] = result
+        return results
+
+    async def _scrape_school_async(self, school, test_pref, fields, client, limiter):
+        key = make_key(school, test_pref, fields)
+        # The snapshot may have to read SQLite
+        data = await asyncio.to_thread(self._lookup, school, key, test_pref, fields)
+        if data:
+            return None, data
+        # Same keys as scrape_school, so a school already being scraped (sync or async) isn't scraped again
+        return await self.school_flights.do_async(
+            key, lambda: self._scrape_live_async(school, key, test_pref, fields, client, limiter))
+
+    async def _scrape_live_async(self, school, key, test_pref, fields, client, limiter):
+        start = time.perf_counter()
+        extractor = await AsyncExtractor.create(school, client, limiter)
+        data = None
+        if await extractor.prefetch_async(pages_for(get_columns(test_pref, fields))):
+            data = extractor.get_full_data(test_pref, fields)
+        return self._finish_live(extractor, key, data, start)
@@ -0,0 +1,98 @@
+"""
+Coalesce concurrent calls for the same key into one.
+
+While a call for a key is in flight, other callers with the same key wait for it and get
+its result (or its exception) instead of doing the work again. Nothing is kept once the
+call finishes; caching is left to page_cache and result_cache.
+
+do() and do_async() share keys, so threads and coroutines on any event loop coalesce
+with each other.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # (loop, future) for each coroutine waiting on the call
+        self.waiters = []
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        # Calls that were answered by another caller's in-flight call
+        self.shared = 0
+
+    def do(self, key, fn):
+        """Return fn(), or the result of the call for key already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+        return call.result
+
+    async def do_async(self, key, fn):
+        """do() for a coroutine function: return await fn(), waiting without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+                waiter = loop.create_future()
+                call.waiters.append((loop, waiter))
+
+        if not leader:
+            await waiter
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = await fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+        return call.result
+
+    def _finish(self, key, call):
+        with self._lock:
+            del self._calls[key]
+        call.done.set()
+        for loop, waiter in call.waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # That loop is closed, so nobody is waiting there anymore
+                pass
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
@@ -0,0 +1,181 @@
+"""
+Versioned local dataset of scraped schools, written by crawler.py.
+
+Each crawl writes a new version into a SQLite file. Lookups read the newest row for each
+school across finished versions into memory once, so serving a school from it is a dict
+lookup; they are reloaded when a crawl in any process finishes a newer version. A crawl
+of a few schools refreshes just those. Rows older than MAX_AGE are
+treated as misses and scraped live. table() serves the same rows to school_query for
+filtering and sorting by numbers.
+"""
+from data import get_columns, normalize_school_name
+from school_index import normalize_key
+from record import SchoolRecord
+from school_query import SchoolTable
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+SNAPSHOT_PATH = os.environ.get("UFIT_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "ufit_snapshot.sqlite3"))
+MAX_AGE = 30 * 24 * 60 * 60
+
+
+class Snapshot:
+    def __init__(self, path=SNAPSHOT_PATH, max_age=MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._rows = None      # key -> (SchoolRecord, scraped_at), newest finished row per school
+        self._table = None     # the same rows as a SchoolTable, for queries
+        self._version = None   # newest finished version when the rows were loaded
+        self._mtime = None     # file mtime at the last check for a new version
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS versions (
+                    version INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            # data is NULL for schools that were not found
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schools (
+                    version INTEGER,
+                    school TEXT,
+                    name TEXT,
+                    data TEXT,
+                    scraped_at REAL,
+                    PRIMARY KEY (version, school)
+                )
+            """)
+        return conn
+
+    # === WRITING (crawler) ===
+
+    def begin(self, source, resume=False):
+        """Start a new version, or with resume=True continue the latest unfinished one"""
+        with self._connect() as conn:
+            if resume:
+                row = conn.execute(
+                    "SELECT version FROM versions WHERE finished_at IS NULL ORDER BY version DESC LIMIT 1"
+                ).fetchone()
+                if row:
+                    return row[0]
+            return conn.execute(
+                "INSERT INTO versions (source, started_at) VALUES (?, ?)", (source, time.time())
+            ).lastrowid
+
+    def done_schools(self, version):
+        """
+        Schools already found in a version, used as the resume checkpoint. Misses aren't
+        included: a network error or timeout also leaves no data, so resuming retries them.
+        """
+        with self._connect() as conn:
+            return {school for school, in conn.execute(
+                "SELECT school FROM schools WHERE version = ? AND data IS NOT NULL", (version,))}
+
+    def add(self, version, school, name, data):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO schools VALUES (?, ?, ?, ?, ?)",
+                (version, school, name, json.dumps(data.to_json()) if data else None, time.time()),
+            )
+
+    def finish(self, version):
+        with self._connect() as conn:
+            conn.execute("UPDATE versions SET finished_at = ? WHERE version = ?", (time.time(), version))
+        # Serve the new version from now on
+        self._rows = None
+        self._table = None
+
+    def versions(self):
+        """[(version, source, started_at, finished_at, schools found)] newest first"""
+        with self._connect() as conn:
+            return conn.execute("""
+                SELECT v.version, v.source, v.started_at, v.finished_at, COUNT(s.data)
+                FROM versions v LEFT JOIN schools s ON s.version = v.version
+                GROUP BY v.version ORDER BY v.version DESC
+            """).fetchall()
+
+    # === READING ===
+
+    def _load(self):
+        rows = {}
+        if os.path.exists(self.path):
+            with self._connect() as conn:
+                # Oldest first, so newer versions overwrite older rows for the same school
+                for school, name, data, scraped_at in conn.execute("""
+                    SELECT s.school, s.name, s.data, s.scraped_at
+                    FROM schools s JOIN versions v ON v.version = s.version
+                    WHERE v.finished_at IS NOT NULL AND s.data IS NOT NULL
+                    ORDER BY s.version
+                """):
+                    entry = (SchoolRecord.from_json(json.loads(data)), scraped_at)
+                    # Reachable by the name that was crawled and the name collegedata uses
+                    rows[normalize_key(school)] = entry
+                    rows[normalize_key(name)] = entry
+        return rows
+
+    def _check_version(self):
+        """Drop the loaded rows if a crawl (usually another process) has finished a newer version"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        # The file only changes when something is written, so most calls stop at the stat
+        if mtime == self._mtime:
+            return
+        version = None
+        if mtime is not None:
+            with self._connect() as conn:
+                version, = conn.execute("SELECT MAX(version) FROM versions WHERE finished_at IS NOT NULL").fetchone()
+        with self._lock:
+            self._mtime = mtime
+            if version != self._version:
+                self._version = version
+                self._rows = None
+                self._table = None
+
+    def rows(self):
+        """key -> (SchoolRecord, scraped_at), loaded on first use and again after each new version"""
+        self._check_version()
+        # Locals, since _check_version on another thread may reset the attributes at any time
+        rows = self._rows
+        if rows is None:
+            with self._lock:
+                rows = self._rows
+                if rows is None:
+                    rows = self._rows = self._load()
+        return rows
+
+    def lookup(self, school, test_pref, fields=None):
+        """The school's row shaped like Extractor.get_full_data, or None if missing or stale"""
+        rows = self.rows()
+        entry = rows.get(normalize_key(normalize_school_name(school))) or rows.get(normalize_key(school))
+        if entry is None:
+            return None
+        data, scraped_at = entry
+        if time.time() - scraped_at >= self.max_age:
+            return None
+        return data.narrow(get_columns(test_pref, fields))
+
+    def table(self):
+        """Every school's newest row as a SchoolTable in name order, built on first use"""
+        rows = self.rows()
+        table = self._table
+        if table is None:
+            # Each entry is stored under two keys; keep one of each
+            entries = {id(entry): entry for entry in rows.values()}
+            table = SchoolTable(sorted((data for data, _ in entries.values()), key=lambda data: data.university))
+            with self._lock:
+                # Unless a newer version replaced the rows meanwhile
+                if self._rows is rows:
+                    self._table = table
+        return table
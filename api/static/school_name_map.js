@@ -1,135 +1,136 @@
+// Generated by api/school_index.py --emit-js from school_index.json. Do not edit by hand.
 const SCHOOL_NAME_MAP = {
-    "ucla": "University of California Los Angeles",
-    "uclosangeles": "University of California Los Angeles",
+    "asu": "Arizona State University",
+    "bc": "Boston College",
+    "bu": "Boston University",
+    "brown": "Brown University",
+    "caltech": "California Institute of Technology",
+    "cmu": "Carnegie Mellon University",
+    "casewestern": "Case Western Reserve University",
+    "cwru": "Case Western Reserve University",
+    "williamandmary": "College of William and Mary",
+    "coloradocollege": "Colorado College",
+    "costate": "Colorado State University",
+    "columbia": "Columbia University",
+    "cornell": "Cornell University",
+    "dartmouth": "Dartmouth College",
+    "duke": "Duke University",
+    "emory": "Emory University",
+    "floraidastate": "Florida State University",
+    "fsu": "Florida State University",
+    "gw": "George Washington University",
+    "gwu": "George Washington University",
+    "georgetown": "Georgetown University",
+    "georgiatech": "Georgia Institute of Technology",
+    "gt": "Georgia Institute of Technology",
+    "harvard": "Harvard University",
+    "isu": "Illinois State University",
+    "indiana": "Indiana University Bloomington",
+    "iu": "Indiana University Bloomington",
+    "iowastate": "Iowa State University",
+    "jhu": "Johns Hopkins University",
+    "lehigh": "Lehigh University",
+    "loyola": "Loyola University Chicago",
+    "mit": "Massachusetts Institute of Technology",
+    "miamiofohio": "Miami University",
+    "miamiohio": "Miami University",
+    "miamiu": "Miami University",
+    "mohio": "Miami University",
+    "msu": "Michigan State University",
+    "nyu": "New York University",
+    "northeastern": "Northeastern University",
+    "northwestern": "Northwestern University",
+    "osu": "Ohio State University",
+    "theohiostate": "Ohio State University",
+    "oklahomastate": "Oklahoma State University Stillwater",
+    "pennstate": "Penn State University Park",
+    "psu": "Penn State University Park",
+    "princeton": "Princeton University",
+    "purdue": "Purdue University",
+    "rice": "Rice University",
+    "rutgers": "Rutgers The State University of New Jersey",
+    "smu": "Southern Methodist University",
+    "stanford": "Stanford University",
+    "texasam": "Texas A M University",
+    "texasamuniversity": "Texas A M University",
+    "tcu": "Texas Christian University",
+    "texaschristian": "Texas Christian University",
+    "tennessee": "The University of Tennessee at Knoxville",
+    "tufts": "Tufts University",
+    "tulane": "Tulane University",
+    "berkeley": "University of California Berkeley",
     "ucb": "University of California Berkeley",
     "ucberkeley": "University of California Berkeley",
-    "berkeley": "University of California Berkeley",
-    "ucsb": "University of California Santa Barbara",
-    "ucsantabarbara": "University of California Santa Barbara",
-    "ucsd": "University of California San Diego",
-    "ucsandiego": "University of California San Diego",
-    "uci": "University of California Irvine",
-    "ucirvine": "University of California Irvine",
     "ucd": "University of California Davis",
     "ucdavis": "University of California Davis",
-    "ucsc": "University of California Santa Cruz",
-    "ucsantacruz": "University of California Santa Cruz",
-    "ucr": "University of California Riverside",
-    "ucriverside": "University of California Riverside",
+    "uci": "University of California Irvine",
+    "ucirvine": "University of California Irvine",
+    "ucla": "University of California Los Angeles",
+    "uclosangeles": "University of California Los Angeles",
     "ucm": "University of California Merced",
     "ucmerced": "University of California Merced",
-    "mizzou": "University of Missouri Columbia",
-    "unversityofmissouri": "University of Missouri Columbia",
-    "mit": "Massachusetts Institute of Technology",
-    "caltech": "California Institute of Technology",
-    "nyu": "New York University",
-    "usc": "University of Southern California",
-    "upenn": "University of Pennsylvania",
-    "penn": "University of Pennsylvania",
-    "pennstate": "Penn State University Park",
-    "psu": "Penn State University Park",
-    "upitt": "University of Pittsburgh",
-    "pitt": "University of Pittsburgh",
-    "washu": "Washington University in St. Louis",
-    "wustl": "Washington University in St. Louis",
-    "uva": "University of Virginia",
-    "umich": "University of Michigan",
-    "umichigan": "University of Michigan",
-    "michigan": "University of Michigan",
-    "umass": "University of Massachusetts Amherst",
-    "universityofmassachusetts": "University of Massachusetts Amherst",
-    "indiana": "Indiana University Bloomington",
-    "iu": "Indiana University Bloomington",
-    "iowa": "University of Iowa",
-    "unc": "University of North Carolina at Chapel Hill",
-    "universityofnorthcarolina": "University of North Carolina at Chapel Hill",
-    "uchicago": "University of Chicago",
+    "ucr": "University of California Riverside",
+    "ucriverside": "University of California Riverside",
+    "ucsandiego": "University of California San Diego",
+    "ucsd": "University of California San Diego",
+    "ucsantabarbara": "University of California Santa Barbara",
+    "ucsb": "University of California Santa Barbara",
+    "ucsantacruz": "University of California Santa Cruz",
+    "ucsc": "University of California Santa Cruz",
     "chicago": "University of Chicago",
-    "gt": "Georgia Institute of Technology",
-    "georgiatech": "Georgia Institute of Technology",
+    "uchicago": "University of Chicago",
+    "boulder": "University of Colorado Boulder",
+    "colorado": "University of Colorado Boulder",
+    "cuboulder": "University of Colorado Boulder",
+    "uf": "University of Florida",
     "uga": "University of Georgia",
-    "smu": "Southern Methodist University",
-    "uiuc": "University of Illinois at Urbana-Champaign",
+    "uic": "University of Illinois at Chicago",
     "illinois": "University of Illinois at Urbana-Champaign",
+    "uiuc": "University of Illinois at Urbana-Champaign",
     "universityofillinois": "University of Illinois at Urbana-Champaign",
     "uofi": "University of Illinois at Urbana-Champaign",
-    "utaustin": "University of Texas at Austin",
-    "universityoftexas": "University of Texas at Austin",
+    "iowa": "University of Iowa",
+    "umd": "University of Maryland College Park",
+    "umass": "University of Massachusetts Amherst",
+    "universityofmassachusetts": "University of Massachusetts Amherst",
+    "miamiflorida": "University of Miami",
+    "umiami": "University of Miami",
+    "michigan": "University of Michigan",
+    "umich": "University of Michigan",
+    "umichigan": "University of Michigan",
+    "minn": "University of Minnesota Twin Cities",
+    "minnesota": "University of Minnesota Twin Cities",
+    "universityofminnesota": "University of Minnesota Twin Cities",
+    "mizzou": "University of Missouri Columbia",
+    "unversityofmissouri": "University of Missouri Columbia",
+    "unc": "University of North Carolina at Chapel Hill",
+    "universityofnorthcarolina": "University of North Carolina at Chapel Hill",
+    "notredame": "University of Notre Dame",
+    "penn": "University of Pennsylvania",
+    "upenn": "University of Pennsylvania",
+    "pitt": "University of Pittsburgh",
+    "upitt": "University of Pittsburgh",
+    "rochester": "University of Rochester",
+    "southcarolina": "University of South Carolina",
+    "uofsc": "University of South Carolina",
+    "usc": "University of Southern California",
     "austin": "University of Texas at Austin",
     "texas": "University of Texas at Austin",
-    "tcu": "Texas Christian University",
-    "texaschristian": "Texas Christian University",
+    "universityoftexas": "University of Texas at Austin",
+    "utaustin": "University of Texas at Austin",
+    "uva": "University of Virginia",
     "uw": "University of Washington",
     "uwashington": "University of Washington",
-    "cwru": "Case Western Reserve University",
-    "casewestern": "Case Western Reserve University",
-    "uwmadison": "University of Wisconsin Madison",
-    "wisconsin": "University of Wisconsin Madison",
     "madison": "University of Wisconsin Madison",
     "universityofwisconsin": "University of Wisconsin Madison",
-    "minnesota": "University of Minnesota Twin Cities",
-    "universityofminnesota": "University of Minnesota Twin Cities",
-    "minn": "University of Minnesota Twin Cities",
-    "virginiatech": "Virginia Polytechnic Institute and State University",
-    "vatech": "Virginia Polytechnic Institute and State University",
-    "loyola": "Loyola University Chicago",
-    "mohio": "Miami University",
-    "miamiohio": "Miami University",
-    "miamiofohio": "Miami University",
-    "miamiu": "Miami University",
-    "umiami": "University of Miami",
-    "miamiflorida": "University of Miami",
-    "umiami": "University of Miami",
-    "osu": "Ohio State University",
-    "theohiostate": "Ohio State University",
-    "msu": "Michigan State University",
-    "uofsc": "University of South Carolina",
-    "gwu": "George Washington University",
-    "gw": "George Washington University",
-    "boulder": "University of Colorado Boulder",
-    "colorado": "University of Colorado Boulder",
-    "cuboulder": "University of Colorado Boulder",
-    "coloradocollege": "Colorado College",
-    "costate": "Colorado State University",
-    "iowastate": "Iowa State University",
-    "tulane": "Tulane University",
-    "isu": "Illinois State University",
-    "duke": "Duke University",
-    "northwestern": "Northwestern University",
-    "northeastern": "Northeastern University",
-    "jhu": "Johns Hopkins University",
+    "uwmadison": "University of Wisconsin Madison",
+    "wisconsin": "University of Wisconsin Madison",
     "vanderbilt": "Vanderbilt University",
-    "cmu": "Carnegie Mellon University",
-    "notredame": "University of Notre Dame",
-    "emory": "Emory University",
-    "georgetown": "Georgetown University",
-    "uf": "University of Florida",
-    "bu": "Boston University",
-    "bc": "Boston College",
-    "tufts": "Tufts University",
-    "rutgers": "Rutgers The State University of New Jersey",
-    "umd": "University of Maryland College Park",
-    "lehigh": "Lehigh University",
-    "purdue": "Purdue University",
-    "rochester": "University of Rochester",
-    "floraidastate": "Florida State University",
-    "fsu": "Florida State University",
-    "texasa&m": "Texas A&M University",
+    "vatech": "Virginia Polytechnic Institute and State University",
+    "virginiatech": "Virginia Polytechnic Institute and State University",
     "wakeforest": "Wake Forest University",
-    "williamandmary": "College of William and Mary",
-    "rice": "Rice University",
-    "columbia": "Columbia University",
-    "dartmouth": "Darthmouth College",
-    "brown": "Brown University",
-    "cornell": "Cornell University",
-    "yale": "Yale University",
-    "stanford": "Stanford University",
-    "harvard": "Harvard University",
-    "princeton": "Princeton University",
-    "uic": "University of Illinois at Chicago",
-    "asu" : "Arizona State University",
-    "tennessee": "The University of Tennessee at Knoxville",
-    "oklahomastate": "Oklahoma State University Stillwater",
-    "southcarolina": "University of South Carolina"
+    "washu": "Washington University in St. Louis",
+    "wustl": "Washington University in St. Louis",
+    "yale": "Yale University"
 }
-export default SCHOOL_NAME_MAP
\ No newline at end of file
+export default SCHOOL_NAME_MAP
@@ -4,6 +4,8 @@ const form = document.querySelector("#form")
 const input = document.querySelector("#text_input")
 const test_pref_buttons = document.querySelector(".test_pref")
 let currentData = null
+// Server-side IDs of every batch shown, so export doesn't upload the rows again
+let resultIds = []
 const homeBtn = document.querySelector(".home-btn")
 const exportBtn = document.querySelector(".export-btn")
 const loader = document.getElementById('loader')
@@ -37,8 +39,15 @@ async function fetchData(schools, testPref) {
     loader.style.display = 'block'
     results.innerHTML = ''
 
+    // Rows from earlier batches stay first when adding more schools
+    const previousData = append ? currentData : []
+    if (!append) resultIds = []
+    append = false
+    const rows = []
+    let skipped = []
+
     try {
-        const response = await fetch('/api/schools', {
+        const response = await fetch('/api/schools/stream', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
@@ -46,17 +55,38 @@ async function fetchData(schools, testPref) {
                 test_pref: testPref
             })
         })
+        if (!response.ok) {
+            throw new Error(`Request failed (${response.status})`)
+        }
 
-
-        const data = await response.json()
-        // Append or replace currentData
-        if (append) {
-            currentData = currentData.concat(data.data)
-            append = false
-        } else {
-            currentData = data.data
+        // Each line is one school's row or skip notice, sent as soon as it is scraped
+        const reader = response.body.getReader()
+        const decoder = new TextDecoder()
+        let buffer = ''
+        while (true) {
+            const { value, done } = await reader.read()
+            if (done) break
+            buffer += decoder.decode(value, { stream: true })
+            const lines = buffer.split('\n')
+            buffer = lines.pop()
+            for (const line of lines) {
+                if (!line.trim()) continue
+                const message = JSON.parse(line)
+                if (message.data) {
+                    // Keep rows in the order the schools were entered
+                    rows.push(message)
+                    rows.sort((a, b) => a.index - b.index)
+                    currentData = previousData.concat(rows.map(row => row.data))
+                    displayTable(currentData)
+                } else if (message.done) {
+                    skipped = message.skipped
+                    resultIds.push(message.result_id)
+                }
+            }
         }
-        if (data.data.length === 0) {
+
+        if (rows.length === 0) {
+            currentData = previousData
             results.innerHTML = '<p>No data found</p>'
             return
         }
@@ -68,12 +98,9 @@ async function fetchData(schools, testPref) {
         title.addEventListener('click', returnHome)
         addBtn.style.display = 'block'
 
-        // Display results as table
-        displayTable(currentData)
-
         // Show skipped schools if any
-        if (data.skipped.length > 0) {
-            results.innerHTML += `<p style="color: red;">Unable to find: ${data.skipped.join(', ')}</p>`
+        if (skipped.length > 0) {
+            results.innerHTML += `<p style="color: red;">Unable to find: ${skipped.join(', ')}</p>`
         }
 
     } catch (error) {
@@ -106,12 +133,16 @@ function displayTable(data) {
 async function exportCSV() {
     if (!currentData) return
 
-    // Fixed: was calling wrong endpoint
-    const response = await fetch('/api/export', {  // Changed from /api/schools
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ data: currentData })  // Fixed: send currentData
-    })
+    // The server streams the file from its saved results; those live on one instance and
+    // expire, so if they're gone send the rows on the page instead
+    let response = resultIds.length ? await fetch(`/api/export?ids=${resultIds.join(',')}&format=csv`) : null
+    if (!response || !response.ok) {
+        response = await fetch('/api/export', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ data: currentData, format: 'csv' })
+        })
+    }
 
     const blob = await response.blob()
     const url = window.URL.createObjectURL(blob)
@@ -128,6 +159,7 @@ function returnHome() {
     results.innerHTML = ''
     input.value = ''
     currentData = null
+    resultIds = []
     title.style.cursor = 'default'
     addBtn.style.display = 'none'
     document.querySelector('.test_pref').style.display = 'block'
@@ -0,0 +1,211 @@
+"""
+Offline scrape benchmarks against recorded fixtures served by replay_server.py.
+
+    python bench/bench_suite.py [--latency 0.1] [--concurrency 1,4,16] [--json results.json]
+
+Measures, with a fresh page cache each time so every page goes over (local) HTTP:
+  - end-to-end get_full_data throughput, one school at a time and through ScrapeEngine
+  - average parse time per page and time per getter (column) on already fetched pages
+  - /api/schools latency (p50/p95/max) at each concurrency level
+
+Record fixtures first with bench/record_fixtures.py. Save --json output before a change and
+compare it with the numbers after.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+import data
+from data import Constants, Extractor, FIELDS, PAGES
+from page_index import PageIndex, parse
+from scraper import ScrapeEngine
+import http_client
+import page_cache
+import replay_server
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+FIXTURES_DIR = replay_server.FIXTURES_DIR
+
+
+def load_schools(fixtures_dir):
+    """School names from the fixture manifest, falling back to the fixture slugs"""
+    manifest = os.path.join(fixtures_dir, "schools.json")
+    if os.path.exists(manifest):
+        with open(manifest, encoding="utf-8") as f:
+            return list(json.load(f).values())
+    return sorted(name for name in os.listdir(fixtures_dir) if os.path.isdir(os.path.join(fixtures_dir, name)))
+
+
+def fresh_cache():
+    """Point the page cache at an empty file so nothing is served from disk"""
+    fd, path = tempfile.mkstemp(suffix=".sqlite3", prefix="ufit_bench_")
+    os.close(fd)
+    page_cache.configure(path=path)
+    return path
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+# === BENCHMARKS ===
+
+def bench_throughput(schools, rounds):
+    """Schools per second: sequential Extractor.get_full_data, then ScrapeEngine.scrape"""
+    results = {}
+    for label, run in (
+        ("sequential", lambda: [Extractor(school).get_full_data(Constants.BOTH) for school in schools]),
+        ("engine", lambda: ScrapeEngine().scrape(schools, Constants.BOTH)),
+    ):
+        times = []
+        for _ in range(rounds):
+            fresh_cache()
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        best = min(times)
+        results[label] = {"seconds": round(best, 3), "schools_per_second": round(len(schools) / best, 2)}
+    return results
+
+
+def bench_getters(schools, fixtures_dir, repeat):
+    """Average ms to parse each page, and to run each column's getter on freshly indexed pages"""
+    pages = replay_server.load_pages(fixtures_dir)
+    fresh_cache()
+    extractors = [Extractor(school) for school in schools]
+    extractors = [ex for ex in extractors if all((ex.name_url, page) in pages for page in PAGES)]
+
+    parse_ms = {page: [] for page in PAGES}
+    getter_ms = {column: [] for column in FIELDS}
+    for _ in range(repeat):
+        for ex in extractors:
+            for page in PAGES:
+                start = time.perf_counter()
+                ex._pages[page] = PageIndex(parse(pages[(ex.name_url, page)].decode("utf-8")))
+                parse_ms[page].append((time.perf_counter() - start) * 1000)
+            for column in FIELDS:
+                # Memoized values would make later columns look free; start each column from a fresh index
+                ex._pages = {page: PageIndex(parse(pages[(ex.name_url, page)].decode("utf-8"))) for page in PAGES}
+                start = time.perf_counter()
+                ex.get_full_data(Constants.BOTH, [column])
+                getter_ms[column].append((time.perf_counter() - start) * 1000)
+
+    average = lambda values: round(statistics.mean(values), 3) if values else None
+    return {
+        "schools": len(extractors),
+        "parse_ms": {page: average(values) for page, values in parse_ms.items()},
+        "getter_ms": {column: average(values) for column, values in getter_ms.items()},
+    }
+
+
+def bench_api(schools, server, levels, requests_per_client, per_request):
+    """/api/schools latency with that many clients posting overlapping school lists at once"""
+    import app as web
+
+    # Measure scraping, not the server-side row caches
+    engine = web.get_engine()
+    engine.result_cache = None
+    engine.snapshot = None
+    client = web.app.test_client()
+    rng = random.Random(0)
+
+    results = {}
+    for level in levels:
+        fresh_cache()
+        upstream_before = server.request_count
+        latencies = []
+        lock = threading.Lock()
+
+        def run_client(lists):
+            for school_list in lists:
+                start = time.perf_counter()
+                response = client.post("/api/schools", json={"schools": school_list, "test_pref": "3"})
+                elapsed = time.perf_counter() - start
+                assert response.status_code == 200, response.status_code
+                with lock:
+                    latencies.append(elapsed)
+
+        work = [[rng.sample(schools, min(per_request, len(schools))) for _ in range(requests_per_client)]
+                for _ in range(level)]
+        threads = [threading.Thread(target=run_client, args=(lists,)) for lists in work]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - start
+
+        results[str(level)] = {
+            "requests": len(latencies),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "max_ms": round(max(latencies) * 1000, 1),
+            "wall_seconds": round(wall, 3),
+            "upstream_requests": server.request_count - upstream_before,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper offline against recorded fixtures")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds injected per replayed request")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=3, help="throughput runs; the best is reported")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the fixtures for getter timings")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated /api/schools client counts")
+    parser.add_argument("--requests", type=int, default=3, help="requests per client at each level")
+    parser.add_argument("--per-request", type=int, default=5, help="schools in each /api/schools request")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.fixtures) or not replay_server.load_pages(args.fixtures):
+        print(f"No fixtures in {args.fixtures}; record some with bench/record_fixtures.py first")
+        return
+
+    server = replay_server.start(args.fixtures, latency=args.latency, jitter=args.jitter)
+    data.SEARCH_URL = server.search_url
+    # The replay server is local, so don't throttle to collegedata's rate
+    http_client.configure(rate_limit=None)
+    schools = load_schools(args.fixtures)
+    print(f"{len(schools)} schools, {args.latency * 1000:.0f} ms injected latency\n")
+
+    results = {"latency": args.latency, "schools": len(schools)}
+
+    results["throughput"] = bench_throughput(schools, args.rounds)
+    print("get_full_data throughput")
+    for label, numbers in results["throughput"].items():
+        print(f"  {label:<12}{numbers['schools_per_second']:>8.2f} schools/s  ({numbers['seconds']:.2f}s)")
+
+    results["getters"] = bench_getters(schools, args.fixtures, args.repeat)
+    print("\nParse time per page")
+    for page, ms in results["getters"]["parse_ms"].items():
+        print(f"  {page:<28}{ms:>8.2f} ms")
+    print("Time per getter (fresh page index)")
+    for column, ms in results["getters"]["getter_ms"].items():
+        print(f"  {column:<28}{ms:>8.3f} ms")
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results["api"] = bench_api(schools, server, levels, args.requests, args.per_request)
+    print("\n/api/schools latency")
+    print(f"  {'clients':<10}{'p50':>10}{'p95':>10}{'max':>10}{'upstream':>10}")
+    for level, numbers in results["api"].items():
+        print(f"  {level:<10}{numbers['p50_ms']:>8.0f}ms{numbers['p95_ms']:>8.0f}ms"
+              f"{numbers['max_ms']:>8.0f}ms{numbers['upstream_requests']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Results saved to {args.json}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Check that classify() gives the same labels with and without NumPy.
+
+    python bench/classify_check.py [--students 200] [--schools 300] [--seed 0]
+
+Builds random students and schools where any number may be missing, and scores exactly
+on a range edge or the GPA margin are common, then compares classify(..., vectorized=True)
+with vectorized=False cell by cell. Exits with status 1 on any difference (or if numpy
+isn't installed).
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+from classify import COMPETITIVE_RATE, GPA_MARGIN, SELECTIVE_RATE, Student, classify
+from record import SchoolRecord
+import argparse
+import random
+
+MISSING = 0.25  # chance of each number being blank
+
+
+def maybe(rng, value):
+    return None if rng.random() < MISSING else value
+
+
+def random_school(rng):
+    record = SchoolRecord(["University", "Avg GPA", "SAT Range", "ACT Range", "Acceptance Rate",
+                           "Likely/Target/Reach"])
+    record.university = f"School {rng.randrange(10 ** 6)}"
+    sat_low = rng.randrange(800, 1500, 10)
+    act_low = rng.randrange(15, 33)
+    # Either range may be missing, and rarely only one end of it
+    record.sat_low, record.sat_high = maybe(rng, sat_low), maybe(rng, sat_low + rng.randrange(0, 200, 10))
+    record.act_low, record.act_high = maybe(rng, act_low), maybe(rng, act_low + rng.randrange(0, 5))
+    record.avg_gpa = maybe(rng, round(rng.uniform(2.8, 4.2), 2))
+    record.acceptance_rate = maybe(rng, rng.choice([SELECTIVE_RATE, COMPETITIVE_RATE, rng.uniform(3, 95)]))
+    return record
+
+
+def random_student(rng, schools):
+    # Copy numbers from a school half the time so ties on the boundaries come up
+    school = rng.choice(schools)
+    gpa, sat, act = rng.uniform(2.5, 4.3), rng.randrange(900, 1610, 10), rng.randrange(16, 37)
+    if rng.random() < 0.5:
+        gpa = school.avg_gpa + rng.choice([-GPA_MARGIN, 0, GPA_MARGIN]) if school.avg_gpa is not None else gpa
+        sat = rng.choice([school.sat_low, school.sat_high]) or sat
+        act = rng.choice([school.act_low, school.act_high]) or act
+    return Student(maybe(rng, gpa), maybe(rng, float(sat)), maybe(rng, float(act)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare vectorized and plain Python classification")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--schools", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    schools = [random_school(rng) for _ in range(args.schools)]
+    students = [random_student(rng, schools) for _ in range(args.students)]
+
+    try:
+        vectorized = classify(students, schools, vectorized=True)
+    except ImportError as e:
+        print(f"⚠ {e}")
+        sys.exit(1)
+    python = classify(students, schools, vectorized=False)
+
+    differences = [(i, j) for i, row in enumerate(python) for j, label in enumerate(row)
+                   if vectorized[i][j] != label]
+    for i, j in differences[:10]:
+        school = schools[j]
+        print(f"⚠ {students[i]} vs SAT {school.sat_low}-{school.sat_high}, ACT {school.act_low}-{school.act_high}, "
+              f"GPA {school.avg_gpa}, rate {school.acceptance_rate}: "
+              f"vectorized {vectorized[i][j]!r}, python {python[i][j]!r}")
+    if differences:
+        print(f"⚠ {len(differences)} of {len(students) * len(schools)} labels differ")
+        sys.exit(1)
+    print(f"✓ {len(students) * len(schools)} labels match")
+
+
+if __name__ == "__main__":
+    main()
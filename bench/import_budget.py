@@ -0,0 +1,76 @@
+"""
+Import-time budget for the Vercel function's cold start.
+
+    python bench/import_budget.py [--budget-ms 250] [--runs 5]
+
+Imports api/app.py in fresh interpreters with -X importtime and fails (exit status 1)
+if the best run is over the budget, or if any module that should only load once a route
+scrapes (requests, bs4, lxml, httpx, openpyxl, data, scraper, ...) got imported. Most of
+what's left is Flask itself; the default budget leaves room for it on a slow instance,
+not for the scraping stack (roughly another 150 ms).
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api")
+
+# Loaded by the first scraping/export route instead of at import
+LAZY_MODULES = ("requests", "urllib3", "bs4", "lxml", "httpx", "openpyxl", "asyncio", "multiprocessing",
+                "data", "scraper", "async_data", "jobs", "snapshot", "result_cache", "page_cache", "school_index",
+                "school_query", "numpy")
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def measure():
+    """[(self µs, cumulative µs, depth, module)] for one cold import of app"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"],
+                            cwd=API_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            entries.append((int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2, match.group(4)))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the cold-start import time of api/app.py")
+    parser.add_argument("--budget-ms", type=float, default=250, help="fail if importing app takes longer")
+    parser.add_argument("--runs", type=int, default=5, help="cold imports; the fastest is compared")
+    parser.add_argument("--top", type=int, default=10, help="direct imports of app to list")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    best = min(runs, key=lambda entries: next(cumulative for _, cumulative, depth, name in entries
+                                              if depth == 0 and name == "app"))
+    total_ms = next(cumulative for _, cumulative, depth, name in best if depth == 0 and name == "app") / 1000
+
+    # -X importtime lists the modules app pulled in just before app itself, one level deeper
+    app_at = next(i for i, (_, _, depth, name) in enumerate(best) if depth == 0 and name == "app")
+    start = max((i + 1 for i, (_, _, depth, _) in enumerate(best[:app_at]) if depth == 0), default=0)
+    children = [(cumulative, name) for _, cumulative, depth, name in best[start:app_at] if depth == 1]
+    print(f"import app: {total_ms:.1f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    for cumulative, name in sorted(children, reverse=True)[:args.top]:
+        print(f"  {name:<28}{cumulative / 1000:>8.1f} ms")
+
+    loaded = sorted({name for _, _, _, name in best[start:app_at]} & set(LAZY_MODULES))
+    failed = False
+    if loaded:
+        print(f"⚠ Loaded at import, should be lazy: {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"⚠ Over budget by {total_ms - args.budget_ms:.1f} ms")
+        failed = True
+    if not failed:
+        print("✓ Within budget")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Parse time per page for each available parser backend, on saved page fixtures.
+
+Fixtures live in bench/fixtures/<school-slug>/<page>.html, one file per subpage
+(base, admission, money-matters, students, campus-life).
+
+    python bench/parse_bench.py [--fixtures DIR] [--repeat N]
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+from page_index import PageIndex, available_parsers, parse
+import argparse
+import glob
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixtures(fixtures_dir):
+    """Returns {page name: [html, ...]} across all recorded schools"""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*", "*.html"))):
+        page = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding="utf-8") as f:
+            pages.setdefault(page, []).append(f.read())
+    return pages
+
+
+def time_parse(htmls, parser, content_only, repeat):
+    """Average ms to parse and index one page"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in htmls:
+            PageIndex(parse(html, parser, content_only))
+    return (time.perf_counter() - start) * 1000 / (repeat * len(htmls))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends on saved pages")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        print(f"No fixtures in {args.fixtures}; save pages as <school-slug>/<page>.html there first")
+        return
+
+    backends = [(name, content_only) for name in available_parsers() for content_only in (False, True)]
+    labels = [f"{name}{' (content only)' if content_only else ''}" for name, content_only in backends]
+    print(f"{'page':<16}" + "".join(f"{label:>28}" for label in labels))
+    for page, htmls in sorted(pages.items()):
+        times = [time_parse(htmls, name, content_only, args.repeat) for name, content_only in backends]
+        print(f"{page:<16}" + "".join(f"{ms:>25.1f} ms" for ms in times))
+
+
+if __name__ == "__main__":
+    main()
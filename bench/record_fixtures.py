@@ -0,0 +1,72 @@
+"""
+Record collegedata pages as fixtures for the offline benchmarks.
+
+Saves the five subpages of each school to bench/fixtures/<school-slug>/<page>.html and
+the school names to bench/fixtures/schools.json. Needs network access; run it again to
+refresh the fixtures when collegedata changes its markup.
+
+    python bench/record_fixtures.py                          the default set of schools
+    python bench/record_fixtures.py --schools "ucla, rice"   just these
+"""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "api"))
+
+from data import Extractor, PAGES
+import http_client
+import argparse
+import json
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Public and private, large and small, with and without ED/EA, SAT and ACT ranges
+DEFAULT_SCHOOLS = [
+    "ucla", "uc berkeley", "umich", "uiuc", "purdue", "georgia tech", "ut austin", "uw madison",
+    "duke", "mit", "stanford", "northwestern", "rice", "tufts", "boston college", "wake forest",
+]
+
+
+def record(schools, fixtures_dir):
+    manifest_path = os.path.join(fixtures_dir, "schools.json")
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    for school in schools:
+        extractor = Extractor(school)
+        pages = {}
+        for page, suffix in PAGES.items():
+            r = http_client.get(f"{extractor.base_url}{suffix}", headers=extractor.headers)
+            if r.status_code != 200:
+                break
+            pages[page] = r.text
+        if len(pages) < len(PAGES):
+            print(f"  ⚠ Warning: could not record '{school}' ({extractor.base_url})")
+            continue
+
+        school_dir = os.path.join(fixtures_dir, extractor.name_url)
+        os.makedirs(school_dir, exist_ok=True)
+        for page, html in pages.items():
+            with open(os.path.join(school_dir, f"{page}.html"), "w", encoding="utf-8") as f:
+                f.write(html)
+        manifest[extractor.name_url] = extractor.name
+        print(f"✓ {extractor.name} -> {school_dir}")
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Save collegedata pages as benchmark fixtures")
+    parser.add_argument("--schools", help="comma-separated schools (default: a representative set)")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    schools = [school.strip() for school in args.schools.split(",")] if args.schools else DEFAULT_SCHOOLS
+    record(schools, args.fixtures)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Local stand-in for collegedata that serves recorded fixtures.
+
+Serves bench/fixtures/<school-slug>/<page>.html at /college-search/<school-slug>[/<page>]
+and 404s everything else, after an optional injected delay per request.
+
+    python bench/replay_server.py --port 8765 --latency 0.15 --jitter 0.05
+    UFIT_SEARCH_URL=http://127.0.0.1:8765/college-search python main.py
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import glob
+import os
+import random
+import threading
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+PREFIX = "/college-search/"
+
+
+def load_pages(fixtures_dir):
+    """Returns {(slug, page): html bytes}"""
+    pages = {}
+    for path in glob.glob(os.path.join(fixtures_dir, "*", "*.html")):
+        slug = os.path.basename(os.path.dirname(path))
+        page = os.path.splitext(os.path.basename(path))[0]
+        with open(path, "rb") as f:
+            pages[(slug, page)] = f.read()
+    return pages
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures_dir=FIXTURES_DIR, latency=0.0, jitter=0.0):
+        super().__init__(address, ReplayHandler)
+        self.pages = load_pages(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.request_count = 0
+        self._count_lock = threading.Lock()
+
+    @property
+    def search_url(self):
+        """Value for data.SEARCH_URL / UFIT_SEARCH_URL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{PREFIX.rstrip('/')}"
+
+    def delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with self.server._count_lock:
+            self.server.request_count += 1
+        self.server.delay()
+
+        path = self.path.split("?")[0]
+        parts = path[len(PREFIX):].strip("/").split("/") if path.startswith(PREFIX) else []
+        key = (parts[0], parts[1] if len(parts) > 1 else "base") if 1 <= len(parts) <= 2 else None
+        body = self.server.pages.get(key)
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(fixtures_dir=FIXTURES_DIR, port=0, latency=0.0, jitter=0.0):
+    """Run a replay server on a background thread; port 0 picks a free one"""
+    server = ReplayServer(("127.0.0.1", port), fixtures_dir, latency, jitter)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded collegedata fixtures locally")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random +/- seconds on top of --latency")
+    args = parser.parse_args()
+
+    server = ReplayServer(("127.0.0.1", args.port), args.fixtures, args.latency, args.jitter)
+    print(f"Serving {len(server.pages)} pages at {server.search_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,15 @@
-from data import Extractor, Constants
+from data import Constants, FIELDS
+from scraper import ScrapeEngine
+from snapshot import Snapshot
+import classify
+import page_cache
+import refresh
+import school_query
+import argparse
 import csv
 
+engine = ScrapeEngine(snapshot=Snapshot())
+
 def export_file(all_results):
     name_input = input("Please enter name for output file: \n")
     if len(name_input) <= 0: 
@@ -31,26 +40,29 @@ def to_csv(all_results):
     else:
         print("\nNo data collected - no CSV file created.")
 
-def get_data(user_input, test_pref):
+def get_data(user_input, test_pref, fields=None, student=None):
     schools = [school.strip() for school in user_input.split(",")]  
     skipped = []
     # Collect all data
     all_results = []
-    for school in schools:
-        ex = Extractor(school)
-        print(f"\nFetching data for: {ex.name}...")
-        results = ex.get_full_data(test_pref)
-        
+    print(f"\nFetching data for {len(schools)} school(s)...")
+    scraped = engine.scrape(schools, test_pref, fields)
+    if student:
+        filled = classify.fill(student, [results for _, results in scraped])
+        scraped = [(ex, results) for (ex, _), results in zip(scraped, filled)]
+    for school, (ex, results) in zip(schools, scraped):
         if results is None:
             # School not found, skip it
             skipped.append(school)
             continue
             
         all_results.append(results)
-        
+        print(f"\nResults for: {results['University']}")
+
         # Print to console
         for k, v in results.items():
             print(f"  {k}: {v}")
+        print(f"  ({ex.request_count} requests)" if ex else "  (from snapshot)")
 
     if len(skipped) > 0: 
         skipped_string = "\n\n Unable to find data for: "
@@ -59,7 +71,161 @@ def get_data(user_input, test_pref):
         print(skipped_string.strip()[:-1])
     return all_results
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scrape collegedata.com admission data into a CSV file")
+    parser.add_argument("--fields", metavar="COLUMNS",
+                        help="comma-separated columns to scrape (e.g. \"SAT Range, Acceptance Rate\"); "
+                             "only the pages those columns need are fetched")
+    parser.add_argument("--live", action="store_true",
+                        help="scrape every school live instead of using the crawler snapshot")
+    parser.add_argument("--offline", action="store_true",
+                        help="only use pages already in the page cache, never hit the network")
+    parser.add_argument("--warm", metavar="SCHOOLS",
+                        help="comma-separated schools to fetch into the page cache, then exit")
+    parser.add_argument("--cache-info", action="store_true",
+                        help="show what the page cache holds, then exit")
+    parser.add_argument("--purge-cache", nargs="?", const="all", choices=["all", "expired"],
+                        help="delete all cached pages (or only expired ones), then exit")
+    parser.add_argument("--refresh", metavar="CSV",
+                        help="update a spreadsheet saved earlier, only re-scraping schools whose pages are stale")
+    parser.add_argument("--max-age", type=float, metavar="DAYS",
+                        help="with --refresh, treat pages older than this as stale (default: the page cache TTLs)")
+    parser.add_argument("--diff", metavar="CSV", help="with --refresh, also save the changed fields to this file")
+    parser.add_argument("--query", nargs="?", const="", metavar="CONDITIONS",
+                        help="list snapshot schools matching conditions, e.g. \"acceptance_rate > 30 and sat_mid < 1400\" "
+                             f"(fields: {', '.join(school_query.NUMERIC_FIELDS)})")
+    parser.add_argument("--sort", metavar="FIELD", help="with --query, order by this field (prefix with - for descending)")
+    parser.add_argument("--limit", type=int, metavar="N", help="with --query, show at most N schools")
+    parser.add_argument("--student", metavar="PROFILE",
+                        help="fill in Likely/Target/Reach for this student, e.g. \"gpa=3.9, sat=1480, act=33\"")
+    parser.add_argument("--classify", metavar="CSV",
+                        help="classify every student in --students against the schools in a saved spreadsheet")
+    parser.add_argument("--students", metavar="CSV", help="with --classify, a file with Name, GPA, SAT and ACT columns")
+    return parser.parse_args()
+
+def cache_commands(args):
+    """Run the page cache switches; returns True if one ran and the program should exit"""
+    cache = page_cache.get_cache()
+    if args.cache_info:
+        stats = cache.stats()
+        print(f"Page cache: {stats['path']} ({stats['bytes'] / 1024:.0f} KB)")
+        for page, counts in sorted(stats["by_page"].items()):
+            print(f"  {page}: {counts['pages']} pages, {counts['stale']} stale")
+        print(f"  school names: {stats['slugs']['resolved']} resolved, {stats['slugs']['misses']} not found")
+        return True
+    if args.purge_cache:
+        removed = cache.purge(expired_only=args.purge_cache == "expired")
+        print(f"✓ Removed {removed} cached pages")
+        return True
+    if args.warm:
+        schools = [school.strip() for school in args.warm.split(",")]
+        # No snapshot: schools already in it would be answered without fetching a page
+        found = sum(1 for _, data in ScrapeEngine().scrape(schools, Constants.BOTH) if data)
+        print(f"✓ Cached pages for {found} of {len(schools)} schools")
+        return True
+    return False
+
+def refresh_file(args):
+    """Refresh a saved spreadsheet, print what changed and save the new rows"""
+    if args.max_age is not None:
+        cache = page_cache.get_cache()
+        page_cache.configure(cache.path, dict.fromkeys(page_cache.PAGE_TTLS, args.max_age * page_cache.DAY), cache.offline)
+    try:
+        rows = refresh.load_rows(args.refresh)
+    except (OSError, ValueError) as e:
+        print(f"Unable to read {args.refresh}: {e}")
+        return
+    if not rows:
+        print(f"No schools in {args.refresh}")
+        return
+
+    print(f"Checking {len(rows)} school(s) from {args.refresh}...")
+    rows, changes, stats = refresh.refresh(rows)
+    print(f"\n✓ {stats['schools'] - stats['rechecked']} up to date, {stats['rechecked']} re-checked "
+          f"({stats['requests']} requests), {stats['changed']} changed")
+    for school, changed in changes.items():
+        print(f"\n{school}")
+        for column, (old, new) in changed.items():
+            print(f"  {column}: {old} -> {new}")
+    if stats["not_found"]:
+        print(f"\n Unable to refresh (kept previous data): {', '.join(stats['not_found'])}")
+    if args.diff:
+        print(f"\n✓ Changes saved to {refresh.write_diff(changes, args.diff)}")
+    to_csv(rows)
+
+def query_snapshot(args):
+    """Print the snapshot schools matching --query in --sort order, then offer to save them"""
+    try:
+        conditions = school_query.parse_where(args.query)
+        sort, descending = school_query.parse_sort(args.sort)
+    except ValueError as e:
+        print(e)
+        return
+    table = Snapshot().table()
+    if not len(table):
+        print("The snapshot is empty. Build one with api/crawler.py first.")
+        return
+
+    results = table.query(conditions, sort, descending, args.limit)
+    print(f"{len(results)} of {len(table)} schools in the snapshot match\n")
+    for school in results:
+        numbers = ", ".join(f"{column}: {school.get(column, 'N/A')}"
+                            for column in ["SAT Range", "ACT Range", "Acceptance Rate", "Cost of Attendance", "Merit Aid"])
+        print(f"  {school['University']} ({numbers})")
+    to_csv(results)
+
+def classify_file(args):
+    """Likely/Target/Reach for every student in --students against every school in --classify, saved as a grid"""
+    try:
+        schools = refresh.load_rows(args.classify)
+        names, students = classify.load_students(args.students)
+    except (OSError, ValueError) as e:
+        print(f"Unable to read input: {e}")
+        return
+    if not schools or not students:
+        print("Need at least one school and one student to classify")
+        return
+
+    grid = classify.classify(students, schools)
+    print(f"✓ Classified {len(students)} student(s) against {len(schools)} school(s)")
+    to_csv([{"Student": name, **{school.university: label for school, label in zip(schools, labels)}}
+            for name, labels in zip(names, grid)])
+
 def main():
+    args = parse_args()
+    if args.live:
+        engine.snapshot = None
+    if args.offline:
+        page_cache.configure(offline=True)
+    if cache_commands(args):
+        return
+    if args.refresh:
+        refresh_file(args)
+        return
+    if args.query is not None or args.sort:
+        query_snapshot(args)
+        return
+    if args.classify or args.students:
+        if not (args.classify and args.students):
+            print("--classify and --students go together")
+            return
+        classify_file(args)
+        return
+    student = None
+    if args.student:
+        try:
+            student = classify.parse_student(args.student)
+        except ValueError as e:
+            print(e)
+            return
+    fields = None
+    if args.fields:
+        fields = [field.strip() for field in args.fields.split(",")]
+        unknown = [field for field in fields if field not in FIELDS]
+        if unknown:
+            print(f"Unknown columns: {', '.join(unknown)}. Choose from: {', '.join(FIELDS)}")
+            return
+
     test_options = input("Please enter test score preference.\n Enter \"1\" for ACT only, \"2\" for SAT only, or \"3\" or any other character for both SAT and ACT \n")
     if test_options.strip().lower() in ["1", "one", "act", "act only"]:
         print("✓ ACT only")
@@ -71,13 +237,13 @@ def main():
         print("✓ SAT and ACT")
         test_pref = Constants.BOTH
     user_input = input("Enter full school name. Please separate each school with a comma. \n")
-    all_results = get_data(user_input, test_pref)
+    all_results = get_data(user_input, test_pref, fields, student)
     done = False
     while not done:
         more_schools = input("\n Would you like to add more schools (y/n)? ")
         if more_schools.strip() in ["y", "yes"]:
             user_input2 = input(f"\nPlease enter school names, separated by a comma.\n")
-            all_results.extend(get_data(user_input2, test_pref))
+            all_results.extend(get_data(user_input2, test_pref, fields, student))
         else:
             done = True
 